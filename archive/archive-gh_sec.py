@@ -7,34 +7,172 @@ Usage:
   export GITHUB_TOKEN=ghp_...  # (optional but recommended)
 """
 
+import base64
+import concurrent.futures
 import csv
+import fcntl
+import json
+import itertools
 import os
 import re
+import threading
 import time
 import sys
 import requests
 from urllib.parse import quote
 
+try:
+    import ijson  # streaming JSON parser for the multi-MB SBOM payload
+except ImportError:
+    ijson = None
+
 API_ROOT = "https://api.github.com"
 SESSION = requests.Session()
 SESSION.headers.update({
     "Accept": "application/vnd.github+json",
     "User-Agent": "gh-security-checklist/1.0"
 })
-TOKEN = os.getenv("GITHUB_TOKEN")
-if TOKEN:
-    SESSION.headers.update({"Authorization": f"Bearer {TOKEN}"})
+# Accept a comma-separated GITHUB_TOKENS pool (round-robin multiplies the
+# 5000 req/hr budget by the number of tokens); GITHUB_TOKEN still works.
+TOKENS = [t.strip()
+          for t in (os.getenv("GITHUB_TOKENS") or os.getenv("GITHUB_TOKEN") or "").split(",")
+          if t.strip()]
+_token_cycle = itertools.cycle(TOKENS) if TOKENS else None
+_token_lock = threading.Lock()
+_HAS_TOKEN = bool(TOKENS)
+_warned_no_token = False
+
+def _next_token():
+    if _token_cycle is None:
+        return None
+    with _token_lock:
+        return next(_token_cycle)
+
+# CSV schema, interned once so row construction and DictWriter key hashing
+# reuse the same string objects across every row.
+_FIELDNAMES = tuple(map(sys.intern,
+                        ["Category", "Insight", "API Endpoint", "Value", "Risk", "Notes"]))
+
+# Compiled once; analyze_actions_pinning scans whole workflow blobs with
+# these (MULTILINE so ^ anchors each line).
+# Steps usually appear as list items ("- uses: actions/checkout@v4"),
+# so the optional dash must be part of the anchor
+_USES_RE = re.compile(r"^\s*(?:-\s+)?uses:\s*([\w\-/\.]+)@([^\s#]+)", re.MULTILINE)
+_SHA40 = re.compile(r"^[0-9a-f]{40}$")
+
+# Conditional-request cache: URL -> {"etag": ..., "body": ...}. A 304 reply
+# costs no primary rate limit and transfers no body, so re-runs against the
+# same repo are nearly free.
+_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".gh_sec_cache.json")
+_cache_lock = threading.Lock()
+_etag_cache = None
+
+def _load_etag_cache():
+    global _etag_cache
+    if _etag_cache is None:
+        try:
+            with open(_CACHE_PATH, "r", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_SH)
+                _etag_cache = json.load(f)
+        except Exception:
+            _etag_cache = {}
+    return _etag_cache
+
+def _store_etag(url, etag, body):
+    with _cache_lock:
+        cache = _load_etag_cache()
+        cache[url] = {"etag": etag, "body": body}
+        try:
+            # Exclusive file lock for multi-process safety.
+            with open(_CACHE_PATH, "a+", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                f.seek(0)
+                f.truncate()
+                json.dump(cache, f)
+        except OSError:
+            pass  # cache is best-effort
+
+# Proactive throttle: remember the latest rate-limit headers and slow down
+# before GitHub starts returning 403s. The semaphore caps in-flight requests
+# so the thread pools stay under the secondary ("abuse") limits.
+_RATE_THRESHOLD = 50
+_rate_lock = threading.Lock()
+_rate_remaining = None
+_rate_reset = 0
+_inflight = threading.Semaphore(4)
+
+def _update_rate_limit(resp):
+    global _rate_remaining, _rate_reset
+    remaining = resp.headers.get("X-RateLimit-Remaining")
+    if remaining is None:
+        return
+    with _rate_lock:
+        try:
+            _rate_remaining = int(remaining)
+            _rate_reset = int(resp.headers.get("X-RateLimit-Reset") or 0)
+        except ValueError:
+            pass
+
+def _throttle():
+    """Spread the remaining budget over the time left until reset."""
+    with _rate_lock:
+        remaining, reset = _rate_remaining, _rate_reset
+    if remaining is not None and remaining < _RATE_THRESHOLD:
+        sleep_for = (reset - time.time()) / max(remaining, 1)
+        if sleep_for > 0:
+            time.sleep(min(sleep_for, 60))
+
+def _response_from_cache(url, entry):
+    """Build a synthetic 200 response carrying the cached body."""
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = url
+    resp._content = entry["body"].encode("utf-8")
+    return resp
 
 def _req(method, url, **kwargs):
-    """Wrapper with simple rate-limit handling and error capture."""
+    """Wrapper with simple rate-limit handling, ETag revalidation and error capture."""
+    cache_entry = None
+    if method == "GET":
+        with _cache_lock:
+            cache_entry = _load_etag_cache().get(url)
+        if cache_entry:
+            kwargs.setdefault("headers", {}).setdefault("If-None-Match", cache_entry["etag"])
+    # Authorization is set per request (not on the session) so concurrent
+    # callers can rotate through the token pool independently.
+    token = _next_token()
+    if token:
+        kwargs.setdefault("headers", {})["Authorization"] = f"Bearer {token}"
     for attempt in range(3):
-        resp = SESSION.request(method, url, timeout=30, **kwargs)
+        _throttle()
+        with _inflight:
+            resp = SESSION.request(method, url, timeout=30, **kwargs)
+        _update_rate_limit(resp)
         # Rate limit?
         if resp.status_code == 403 and resp.headers.get("X-RateLimit-Remaining") == "0":
+            if not _HAS_TOKEN:
+                # The unauthenticated budget (60 req/hr) won't recover within
+                # any reasonable sleep; retrying just hangs for minutes.
+                global _warned_no_token
+                if not _warned_no_token:
+                    _warned_no_token = True
+                    print("Rate limited without credentials; set GITHUB_TOKEN "
+                          "(or GITHUB_TOKENS) for a 5000 req/hr budget.",
+                          file=sys.stderr)
+                return resp
+            if len(TOKENS) > 1:
+                # Another token may still have budget; switch instead of sleeping.
+                kwargs["headers"]["Authorization"] = f"Bearer {_next_token()}"
+                continue
             reset = int(resp.headers.get("X-RateLimit-Reset", "0"))
             sleep_for = max(0, reset - int(time.time()) + 1)
             time.sleep(min(sleep_for, 60))
             continue
+        if method == "GET":
+            if resp.status_code == 304 and cache_entry:
+                return _response_from_cache(url, cache_entry)
+            if resp.status_code == 200 and resp.headers.get("ETag"):
+                _store_etag(url, resp.headers["ETag"], resp.text)
         return resp
     return resp  # last response
 
@@ -50,47 +188,154 @@ def safe_get_json(url, params=None):
             j = {"message": r.text}
         return None, r.status_code, j.get("message") if isinstance(j, dict) else str(e)
 
+# One GraphQL round-trip covers what used to be ~8 separate REST calls:
+# repo metadata, branch protection, license, environments, vulnerability
+# alerts, and the HEAD commit signature.
+_CHECKLIST_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    isPrivate
+    isArchived
+    defaultBranchRef { name }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    licenseInfo { spdxId key url }
+    branchProtectionRules(first: 10) {
+      nodes {
+        pattern
+        requiresApprovingReviews
+        requiresStatusChecks
+        allowsForcePushes
+        allowsDeletions
+      }
+    }
+    environments(first: 50) { nodes { name } }
+    vulnerabilityAlerts(first: 1) { totalCount }
+    object(expression: "HEAD") { ... on Commit { signature { isValid } } }
+  }
+}
+"""
+
+def _graphql(query, variables):
+    """POST a query to the GraphQL endpoint. Returns (data, error message)."""
+    resp = _req("POST", f"{API_ROOT}/graphql",
+                json={"query": query, "variables": variables})
+    try:
+        j = resp.json()
+    except Exception:
+        return None, resp.text
+    if resp.status_code != 200 or j.get("errors"):
+        errs = j.get("errors") or [{"message": f"HTTP {resp.status_code}"}]
+        return None, "; ".join(e.get("message", "") for e in errs)
+    return j.get("data"), None
+
+# One recursive Trees call replaces the per-path /contents probes: presence
+# checks and the workflow listing become local dict lookups afterwards.
+_tree_lock = threading.Lock()
+_tree_cache = {}
+
+def _load_tree(owner, repo, sha="HEAD"):
+    """Return {path: blob sha} for the repo tree, or None if unavailable."""
+    key = (owner, repo, sha)
+    with _tree_lock:
+        if key not in _tree_cache:
+            j, code, err = safe_get_json(
+                f"{API_ROOT}/repos/{owner}/{repo}/git/trees/{quote(sha)}",
+                params={"recursive": "1"})
+            if j and isinstance(j.get("tree"), list):
+                _tree_cache[key] = {e["path"]: e.get("sha")
+                                    for e in j["tree"] if e.get("type") == "blob"}
+            else:
+                _tree_cache[key] = None
+        return _tree_cache[key]
+
+def _head(url):
+    """Header-only request; enough when only the status code matters."""
+    return _req("HEAD", url)
+
 def find_file_presence(owner, repo, paths):
     """Return (found_path, url or None)."""
+    tree = _load_tree(owner, repo)
+    if tree is not None:
+        p = next((p for p in paths if p in tree), None)
+        if p:
+            return p, f"https://github.com/{owner}/{repo}/blob/HEAD/{p}"
+        return None, None
+    # Fallback when the tree is unavailable (e.g. empty repo): HEAD-probe each
+    # path -- a /contents GET would download up to 1 MB of base64 just to
+    # check existence.
     for p in paths:
-        j, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}/contents/{quote(p)}")
-        if j and isinstance(j, dict) and j.get("type") in ("file", "symlink"):
-            return p, j.get("html_url")
+        if _head(f"{API_ROOT}/repos/{owner}/{repo}/contents/{quote(p)}").status_code == 200:
+            return p, f"https://github.com/{owner}/{repo}/blob/HEAD/{p}"
     return None, None
 
-def analyze_actions_pinning(workflows, owner, repo):
+def _fetch_workflow_text(path, sha, owner, repo):
+    """Fetch one workflow file's text; returns (text, path) or (None, None).
+
+    Blobs are fetched by SHA (immutable, so ETag revalidation always hits)
+    and base64-decoded in-process; the raw host is only a fallback.
+    """
+    if sha:
+        j, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}/git/blobs/{sha}")
+        if j and j.get("encoding") == "base64" and j.get("content"):
+            return base64.b64decode(j["content"]).decode("utf-8", "replace"), path
+    raw_resp = _req("GET", f"https://raw.githubusercontent.com/{owner}/{repo}/HEAD/{path}")
+    if raw_resp.status_code != 200:
+        return None, None
+    return raw_resp.text or "", path
+
+def _count_sbom_packages(owner, repo):
+    """Count SBOM packages; returns (count or None, status, error).
+
+    The SBOM response can run to megabytes; when ijson is available the
+    package array is counted in streaming mode without ever materializing
+    the package dicts.
+    """
+    url = f"{API_ROOT}/repos/{owner}/{repo}/dependency-graph/sbom"
+    if ijson is not None:
+        try:
+            # Streaming bypasses _req, so the token, throttle and
+            # in-flight cap have to be applied here as well
+            headers = {}
+            token = _next_token()
+            if token:
+                headers["Authorization"] = f"Bearer {token}"
+            _throttle()
+            with _inflight:
+                resp = SESSION.get(url, timeout=30, stream=True, headers=headers)
+            _update_rate_limit(resp)
+            with resp:
+                if resp.status_code == 200:
+                    resp.raw.decode_content = True
+                    return sum(1 for _ in ijson.items(resp.raw, "sbom.packages.item")), 200, None
+        except Exception:
+            pass  # fall through to the buffered path
+    sbom, code, err = safe_get_json(url)
+    if sbom and isinstance(sbom, dict):
+        return len(sbom.get("sbom", {}).get("packages", [])), code, None
+    return None, code, err
+
+def analyze_actions_pinning(workflow_blobs, owner, repo):
     """
     Heuristic: look for 'uses: owner/action@ref'.
     If ref looks like a full SHA (40-hex), count as pinned; if tag/branch, unpinned.
+
+    Workflow contents are fetched concurrently; SESSION is thread-safe for
+    GETs, and 8 workers stays under GitHub's secondary rate limits.
     """
     pinned, unpinned = 0, 0
-    sha40 = re.compile(r"^[0-9a-f]{40}$")
-    for wf in workflows:
-        # Fetch workflow file content
-        j, code, err = safe_get_json(wf["url"])
-        if not j or "path" not in j:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda blob: _fetch_workflow_text(blob[0], blob[1], owner, repo),
+            workflow_blobs))
+    for text, path in results:
+        if text is None:
             continue
-        # Download raw content
-        # Preferred raw content endpoint:
-        raw_resp = _req("GET", f"https://raw.githubusercontent.com/{owner}/{repo}/HEAD/{j['path']}")
-        if raw_resp.status_code != 200:
-            # Try download_url as fallback
-            dl = j.get("download_url")
-            if not dl:
-                continue
-            raw_resp = _req("GET", dl)
-            if raw_resp.status_code != 200:
-                continue
-        text = raw_resp.text or ""
-        # Grep lines with 'uses:'
-        for line in text.splitlines():
-            m = re.search(r"uses:\s*([\w\-/\.]+)@([^\s#]+)", line.strip())
-            if m:
-                ref = m.group(2).strip()
-                if sha40.match(ref):
-                    pinned += 1
-                else:
-                    unpinned += 1
+        # Single multiline scan over the whole blob; no per-line splitting.
+        for m in _USES_RE.finditer(text):
+            if _SHA40.match(m.group(2)):
+                pinned += 1
+            else:
+                unpinned += 1
     return pinned, unpinned
 
 def risk(flag, when_true="Low", when_false="High", unknown="Unknown"):
@@ -102,211 +347,231 @@ def risk(flag, when_true="Low", when_false="High", unknown="Unknown"):
 
 def generate_security_checklist(owner, repo, out_csv=None):
     out_csv = out_csv or f"security_checklist_{owner}_{repo}.csv"
-    rows = []
-
-    def add(category, insight, endpoint, value, notes="", risk_level="Unknown"):
-        rows.append({
-            "Category": category,
-            "Insight": insight,
-            "API Endpoint": endpoint,
-            "Value": value,
-            "Risk": risk_level,
-            "Notes": notes
-        })
-
-    # 1) Repository metadata
-    repo_json, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}")
-    if not repo_json:
-        raise SystemExit(f"Failed to fetch repo: {code} {err}")
-
-    visibility = "private" if repo_json.get("private") else "public"
-    archived = bool(repo_json.get("archived"))
-    default_branch = repo_json.get("default_branch", "main")
-    topics = ", ".join(repo_json.get("topics", []))
-
-    add("Repository Metadata", "Visibility", f"/repos/{owner}/{repo}",
-        visibility, risk_level="Informational")
-    add("Repository Metadata", "Archived", f"/repos/{owner}/{repo}",
-        str(archived), risk_level=risk(archived, when_true="Low", when_false="Informational"))
-    add("Repository Metadata", "Default branch", f"/repos/{owner}/{repo}",
-        default_branch, risk_level="Informational")
-    add("Repository Metadata", "Topics", f"/repos/{owner}/{repo}",
-        topics or "None", risk_level="Informational")
-
-    # 2) Branch protection (default branch)
-    prot_json, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}/branches/{quote(default_branch)}/protection")
-    if prot_json:
-        # Required reviews / status checks
-        pr_reviews = prot_json.get("required_pull_request_reviews") or {}
-        status_checks = prot_json.get("required_status_checks") or {}
-        allow_force_pushes = prot_json.get("allow_force_pushes", {}).get("enabled")
-        allow_deletions = prot_json.get("allow_deletions", {}).get("enabled")
-
-        add("Branch Protection", "Required PR reviews",
-            f"/repos/{owner}/{repo}/branches/{default_branch}/protection",
-            "enabled" if pr_reviews else "disabled",
-            risk_level=risk(bool(pr_reviews), when_true="Low", when_false="High"))
-
-        add("Branch Protection", "Required status checks",
-            f"/repos/{owner}/{repo}/branches/{default_branch}/protection",
-            "enabled" if status_checks else "disabled",
-            risk_level=risk(bool(status_checks), when_true="Low", when_false="Medium"))
-
-        add("Branch Protection", "Force pushes allowed?",
-            f"/repos/{owner}/{repo}/branches/{default_branch}/protection",
-            str(bool(allow_force_pushes)),
-            risk_level=risk(allow_force_pushes is False, when_true="Low", when_false="High"))
-
-        add("Branch Protection", "Allow branch deletions?",
-            f"/repos/{owner}/{repo}/branches/{default_branch}/protection",
-            str(bool(allow_deletions)),
-            risk_level=risk(allow_deletions is False, when_true="Low", when_false="Medium"))
-    else:
-        add("Branch Protection", "Protection (default branch)",
-            f"/repos/{owner}/{repo}/branches/{default_branch}/protection",
-            "unavailable", notes=f"{code}: {err}",
-            risk_level="High")  # assume high risk if unknown (often disabled or no access)
-
-    # 3) Security policy & governance files
-    sec_path, sec_url = find_file_presence(owner, repo, ["SECURITY.md", ".github/SECURITY.md", "docs/SECURITY.md"])
-    add("Security Policy", "SECURITY.md present",
-        "/repos/{owner}/{repo}/contents/SECURITY.md",
-        "yes" if sec_path else "no",
-        notes=sec_url or "",
-        risk_level=risk(bool(sec_path), when_true="Low", when_false="Medium"))
-
-    co_path, co_url = find_file_presence(owner, repo, [".github/CODEOWNERS", "CODEOWNERS", "docs/CODEOWNERS"])
-    add("Governance", "CODEOWNERS present",
-        "/repos/{owner}/{repo}/contents/CODEOWNERS",
-        "yes" if co_path else "no",
-        notes=co_url or "",
-        risk_level=risk(bool(co_path), when_true="Low", when_false="Medium"))
-
-    lic_json, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}/license")
-    if lic_json and lic_json.get("license"):
-        add("Legal", "License",
-            f"/repos/{owner}/{repo}/license",
-            lic_json["license"].get("spdx_id") or lic_json["license"].get("key") or "custom",
-            notes=lic_json.get("html_url", ""),
-            risk_level="Informational")
-    else:
-        add("Legal", "License",
-            f"/repos/{owner}/{repo}/license",
-            "unavailable", notes=f"{code}: {err or 'no license detected'}",
-            risk_level="Medium")
-
-    # 4) Actions workflows + pinning heuristic
-    wfs, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}/actions/workflows")
-    if wfs and isinstance(wfs.get("workflows"), list):
-        workflows = wfs["workflows"]
-        add("Automation", "Workflow count", f"/repos/{owner}/{repo}/actions/workflows",
-            str(len(workflows)), risk_level="Informational")
-
-        pinned, unpinned = analyze_actions_pinning(workflows, owner, repo)
-        add("Automation", "External actions pinned to commit SHA",
-            "(raw file scan of workflows)", str(pinned),
-            risk_level=risk(pinned > 0 and unpinned == 0, when_true="Low", when_false="Medium"))
-        add("Automation", "External actions NOT pinned (tag/branch)",
-            "(raw file scan of workflows)", str(unpinned),
-            risk_level=risk(unpinned == 0, when_true="Low", when_false="Medium-High"))
-    else:
-        add("Automation", "Workflows list",
-            f"/repos/{owner}/{repo}/actions/workflows",
-            "unavailable", notes=f"{code}: {err}", risk_level="Unknown")
-
-    # 5) Environments (protected deployments)
-    envs, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}/environments")
-    if envs and isinstance(envs.get("environments"), list):
-        env_names = [e.get("name") for e in envs["environments"]]
+
+    # Stream rows straight to disk as each section completes: peak memory
+    # stays O(1) and a killed run still leaves partial output behind.
+    with open(out_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(_FIELDNAMES))
+        writer.writeheader()
+
+        def add(category, insight, endpoint, value, notes="", risk_level="Unknown"):
+            # Category/insight/risk labels recur many times per report;
+            # interning them deduplicates the strings across rows.
+            writer.writerow({
+                "Category": sys.intern(category),
+                "Insight": sys.intern(insight),
+                "API Endpoint": endpoint,
+                "Value": value,
+                "Risk": sys.intern(risk_level),
+                "Notes": notes
+            })
+
+        # 1) Repository metadata, branch protection, license, environments,
+        #    vulnerability alerts, and HEAD commit signature: one GraphQL call.
+        gql_data, gql_err = _graphql(_CHECKLIST_QUERY, {"owner": owner, "name": repo})
+        repo_node = (gql_data or {}).get("repository")
+        if not repo_node:
+            raise SystemExit(f"Failed to fetch repo: {gql_err}")
+
+        visibility = "private" if repo_node.get("isPrivate") else "public"
+        archived = bool(repo_node.get("isArchived"))
+        default_branch = (repo_node.get("defaultBranchRef") or {}).get("name") or "main"
+        topic_nodes = (repo_node.get("repositoryTopics") or {}).get("nodes") or []
+        topics = ", ".join(n["topic"]["name"] for n in topic_nodes if n.get("topic"))
+
+        add("Repository Metadata", "Visibility", "graphql: repository",
+            visibility, risk_level="Informational")
+        add("Repository Metadata", "Archived", "graphql: repository",
+            str(archived), risk_level=risk(archived, when_true="Low", when_false="Informational"))
+        add("Repository Metadata", "Default branch", "graphql: repository",
+            default_branch, risk_level="Informational")
+        add("Repository Metadata", "Topics", "graphql: repository",
+            topics or "None", risk_level="Informational")
+
+        # 2) Branch protection (rule matching the default branch, else first rule)
+        rules = (repo_node.get("branchProtectionRules") or {}).get("nodes") or []
+        rule = next((r for r in rules if r.get("pattern") == default_branch),
+                    rules[0] if rules else None)
+        if rule:
+            pr_reviews = rule.get("requiresApprovingReviews")
+            status_checks = rule.get("requiresStatusChecks")
+            allow_force_pushes = rule.get("allowsForcePushes")
+            allow_deletions = rule.get("allowsDeletions")
+
+            add("Branch Protection", "Required PR reviews",
+                "graphql: repository.branchProtectionRules",
+                "enabled" if pr_reviews else "disabled",
+                risk_level=risk(bool(pr_reviews), when_true="Low", when_false="High"))
+
+            add("Branch Protection", "Required status checks",
+                "graphql: repository.branchProtectionRules",
+                "enabled" if status_checks else "disabled",
+                risk_level=risk(bool(status_checks), when_true="Low", when_false="Medium"))
+
+            add("Branch Protection", "Force pushes allowed?",
+                "graphql: repository.branchProtectionRules",
+                str(bool(allow_force_pushes)),
+                risk_level=risk(allow_force_pushes is False, when_true="Low", when_false="High"))
+
+            add("Branch Protection", "Allow branch deletions?",
+                "graphql: repository.branchProtectionRules",
+                str(bool(allow_deletions)),
+                risk_level=risk(allow_deletions is False, when_true="Low", when_false="Medium"))
+        else:
+            add("Branch Protection", "Protection (default branch)",
+                "graphql: repository.branchProtectionRules",
+                "unavailable", notes="no branch protection rules visible",
+                risk_level="High")  # assume high risk if unknown (often disabled or no access)
+
+        # The remaining REST-only probes are independent of each other, so issue
+        # them concurrently over the shared SESSION instead of serially; the
+        # same 8-worker bound keeps us under GitHub's secondary rate limits.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            tree_future = executor.submit(_load_tree, owner, repo)
+            sec_future = executor.submit(
+                find_file_presence, owner, repo,
+                ["SECURITY.md", ".github/SECURITY.md", "docs/SECURITY.md"])
+            co_future = executor.submit(
+                find_file_presence, owner, repo,
+                [".github/CODEOWNERS", "CODEOWNERS", "docs/CODEOWNERS"])
+            sbom_future = executor.submit(_count_sbom_packages, owner, repo)
+            code_scan_future = executor.submit(
+                safe_get_json, f"{API_ROOT}/repos/{owner}/{repo}/code-scanning/alerts?per_page=100")
+            secret_scan_future = executor.submit(
+                safe_get_json, f"{API_ROOT}/repos/{owner}/{repo}/secret-scanning/alerts?per_page=100")
+            collab_future = executor.submit(
+                safe_get_json, f"{API_ROOT}/repos/{owner}/{repo}/collaborators?per_page=1")
+
+        # 3) Security policy & governance files
+        sec_path, sec_url = sec_future.result()
+        add("Security Policy", "SECURITY.md present",
+            "/repos/{owner}/{repo}/contents/SECURITY.md",
+            "yes" if sec_path else "no",
+            notes=sec_url or "",
+            risk_level=risk(bool(sec_path), when_true="Low", when_false="Medium"))
+
+        co_path, co_url = co_future.result()
+        add("Governance", "CODEOWNERS present",
+            "/repos/{owner}/{repo}/contents/CODEOWNERS",
+            "yes" if co_path else "no",
+            notes=co_url or "",
+            risk_level=risk(bool(co_path), when_true="Low", when_false="Medium"))
+
+        lic = repo_node.get("licenseInfo")
+        if lic:
+            add("Legal", "License",
+                "graphql: repository.licenseInfo",
+                lic.get("spdxId") or lic.get("key") or "custom",
+                notes=lic.get("url") or "",
+                risk_level="Informational")
+        else:
+            add("Legal", "License",
+                "graphql: repository.licenseInfo",
+                "unavailable", notes="no license detected",
+                risk_level="Medium")
+
+        # 4) Actions workflows + pinning heuristic (paths filtered from the tree)
+        tree = tree_future.result()
+        if tree is not None:
+            workflow_blobs = sorted(
+                (p, s) for p, s in tree.items()
+                if p.startswith(".github/workflows/") and p.endswith((".yml", ".yaml")))
+            add("Automation", "Workflow count", f"/repos/{owner}/{repo}/git/trees/HEAD",
+                str(len(workflow_blobs)), risk_level="Informational")
+
+            pinned, unpinned = analyze_actions_pinning(workflow_blobs, owner, repo)
+            add("Automation", "External actions pinned to commit SHA",
+                "(raw file scan of workflows)", str(pinned),
+                risk_level=risk(pinned > 0 and unpinned == 0, when_true="Low", when_false="Medium"))
+            add("Automation", "External actions NOT pinned (tag/branch)",
+                "(raw file scan of workflows)", str(unpinned),
+                risk_level=risk(unpinned == 0, when_true="Low", when_false="Medium-High"))
+        else:
+            add("Automation", "Workflows list",
+                f"/repos/{owner}/{repo}/git/trees/HEAD",
+                "unavailable", notes="repo tree not accessible", risk_level="Unknown")
+
+        # 5) Environments (protected deployments)
+        env_names = [e.get("name")
+                     for e in (repo_node.get("environments") or {}).get("nodes") or []]
         add("Deployments", "Protected environments",
-            f"/repos/{owner}/{repo}/environments",
+            "graphql: repository.environments",
             ", ".join(env_names) if env_names else "none",
             risk_level=risk(bool(env_names), when_true="Low", when_false="Informational"))
-    else:
-        add("Deployments", "Protected environments",
-            f"/repos/{owner}/{repo}/environments",
-            "unavailable", notes=f"{code}: {err}", risk_level="Unknown")
 
-    # 6) Dependency/SBOM (may require permissions; works for many public repos)
-    sbom, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}/dependency-graph/sbom")
-    if sbom and isinstance(sbom, dict):
-        dep_count = len(sbom.get("sbom", {}).get("packages", []))
-        add("Dependencies", "SBOM packages",
-            f"/repos/{owner}/{repo}/dependency-graph/sbom",
-            str(dep_count), risk_level="Informational")
-    else:
-        add("Dependencies", "SBOM packages",
-            f"/repos/{owner}/{repo}/dependency-graph/sbom",
-            "unavailable", notes=f"{code}: {err}", risk_level="Unknown")
-
-    # 7) Code scanning alerts (public visibility varies by repo)
-    alerts, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}/code-scanning/alerts?per_page=100")
-    if isinstance(alerts, list):
-        add("Scanning", "Code scanning alerts (count)",
-            f"/repos/{owner}/{repo}/code-scanning/alerts",
-            str(len(alerts)),
-            risk_level=risk(len(alerts) == 0, when_true="Low", when_false="Medium"))
-    else:
-        add("Scanning", "Code scanning alerts",
-            f"/repos/{owner}/{repo}/code-scanning/alerts",
-            "unavailable", notes=f"{code}: {err}", risk_level="Unknown")
-
-    # 8) Secret scanning alerts (usually requires org/repo permissions)
-    secrets, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}/secret-scanning/alerts?per_page=100")
-    if isinstance(secrets, list):
-        add("Scanning", "Secret scanning alerts (count)",
-            f"/repos/{owner}/{repo}/secret-scanning/alerts",
-            str(len(secrets)),
-            risk_level=risk(len(secrets) == 0, when_true="Low", when_false="High"))
-    else:
-        add("Scanning", "Secret scanning alerts",
-            f"/repos/{owner}/{repo}/secret-scanning/alerts",
-            "unavailable", notes=f"{code}: {err}", risk_level="Unknown")
-
-    # 9) Dependabot alerts (often requires security_events scope)
-    deps, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}/dependabot/alerts?per_page=100")
-    if isinstance(deps, list):
-        add("Dependencies", "Dependabot alerts (count)",
-            f"/repos/{owner}/{repo}/dependabot/alerts",
-            str(len(deps)),
-            risk_level=risk(len(deps) == 0, when_true="Low", when_false="Medium-High"))
-    else:
-        add("Dependencies", "Dependabot alerts",
-            f"/repos/{owner}/{repo}/dependabot/alerts",
-            "unavailable", notes=f"{code}: {err}", risk_level="Unknown")
-
-    # 10) Commit verification (sample recent commit on default branch)
-    commits, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}/commits?sha={quote(default_branch)}&per_page=1")
-    if isinstance(commits, list) and commits:
-        v = commits[0].get("commit", {}).get("verification") or commits[0].get("verification")
-        verified = v.get("verified") if isinstance(v, dict) else commits[0].get("verification", {}).get("verified")
-        add("Commits", "Latest commit verified",
-            f"/repos/{owner}/{repo}/commits",
-            str(bool(verified)),
-            risk_level=risk(bool(verified), when_true="Low", when_false="Medium"))
-    else:
-        add("Commits", "Latest commit verified",
-            f"/repos/{owner}/{repo}/commits",
-            "unavailable", notes=f"{code}: {err}", risk_level="Unknown")
-
-    # 11) Collaborator/permission surface (only returns with access; otherwise unavailable)
-    collabs, code, err = safe_get_json(f"{API_ROOT}/repos/{owner}/{repo}/collaborators?per_page=1")
-    if isinstance(collabs, list):
-        add("Access Control", "Collaborators endpoint",
-            f"/repos/{owner}/{repo}/collaborators",
-            "accessible", risk_level="Informational")
-    else:
-        add("Access Control", "Collaborators endpoint",
-            f"/repos/{owner}/{repo}/collaborators",
-            "unavailable", notes=f"{code}: {err}", risk_level="Unknown")
-
-    # Write CSV
-    fieldnames = ["Category", "Insight", "API Endpoint", "Value", "Risk", "Notes"]
-    with open(out_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
+        # 6) Dependency/SBOM (may require permissions; works for many public repos)
+        dep_count, code, err = sbom_future.result()
+        if dep_count is not None:
+            add("Dependencies", "SBOM packages",
+                f"/repos/{owner}/{repo}/dependency-graph/sbom",
+                str(dep_count), risk_level="Informational")
+        else:
+            add("Dependencies", "SBOM packages",
+                f"/repos/{owner}/{repo}/dependency-graph/sbom",
+                "unavailable", notes=f"{code}: {err}", risk_level="Unknown")
+
+        # 7) Code scanning alerts (public visibility varies by repo)
+        alerts, code, err = code_scan_future.result()
+        if isinstance(alerts, list):
+            add("Scanning", "Code scanning alerts (count)",
+                f"/repos/{owner}/{repo}/code-scanning/alerts",
+                str(len(alerts)),
+                risk_level=risk(len(alerts) == 0, when_true="Low", when_false="Medium"))
+        else:
+            add("Scanning", "Code scanning alerts",
+                f"/repos/{owner}/{repo}/code-scanning/alerts",
+                "unavailable", notes=f"{code}: {err}", risk_level="Unknown")
+
+        # 8) Secret scanning alerts (usually requires org/repo permissions)
+        secrets, code, err = secret_scan_future.result()
+        if isinstance(secrets, list):
+            add("Scanning", "Secret scanning alerts (count)",
+                f"/repos/{owner}/{repo}/secret-scanning/alerts",
+                str(len(secrets)),
+                risk_level=risk(len(secrets) == 0, when_true="Low", when_false="High"))
+        else:
+            add("Scanning", "Secret scanning alerts",
+                f"/repos/{owner}/{repo}/secret-scanning/alerts",
+                "unavailable", notes=f"{code}: {err}", risk_level="Unknown")
+
+        # 9) Vulnerability (Dependabot) alerts (often requires security_events scope)
+        vuln = repo_node.get("vulnerabilityAlerts")
+        if isinstance(vuln, dict) and isinstance(vuln.get("totalCount"), int):
+            alert_count = vuln["totalCount"]
+            add("Dependencies", "Dependabot alerts (count)",
+                "graphql: repository.vulnerabilityAlerts",
+                str(alert_count),
+                risk_level=risk(alert_count == 0, when_true="Low", when_false="Medium-High"))
+        else:
+            add("Dependencies", "Dependabot alerts",
+                "graphql: repository.vulnerabilityAlerts",
+                "unavailable", notes="not visible with current token", risk_level="Unknown")
+
+        # 10) Commit verification (HEAD commit signature on default branch)
+        head = repo_node.get("object") or {}
+        sig = head.get("signature")
+        if head:
+            verified = bool(sig and sig.get("isValid"))
+            add("Commits", "Latest commit verified",
+                "graphql: repository.object(HEAD)",
+                str(verified),
+                risk_level=risk(verified, when_true="Low", when_false="Medium"))
+        else:
+            add("Commits", "Latest commit verified",
+                "graphql: repository.object(HEAD)",
+                "unavailable", notes="no HEAD commit visible", risk_level="Unknown")
+
+        # 11) Collaborator/permission surface (only returns with access; otherwise unavailable)
+        collabs, code, err = collab_future.result()
+        if isinstance(collabs, list):
+            add("Access Control", "Collaborators endpoint",
+                f"/repos/{owner}/{repo}/collaborators",
+                "accessible", risk_level="Informational")
+        else:
+            add("Access Control", "Collaborators endpoint",
+                f"/repos/{owner}/{repo}/collaborators",
+                "unavailable", notes=f"{code}: {err}", risk_level="Unknown")
+
 
     return out_csv
 
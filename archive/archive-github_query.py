@@ -3,37 +3,61 @@
 Query GitHub API for repository information and save as JSON
 """
 
+import concurrent.futures
 import requests
+import requests_cache
 import json
 import csv
 from pathlib import Path
 from typing import Optional, Dict, Any
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # C codec; several times faster than stdlib json
+except ImportError:
+    orjson = None
+
+# Shared session: keep-alive reuses the TCP+TLS connection to
+# api.github.com across calls instead of paying a handshake per request,
+# and urllib3 retries transient failures with backoff for free. Default
+# headers are set once so per-call dicts only ever carry the auth token.
+# The sqlite backing store plus cache_control=True means stale entries
+# revalidate via ETag/If-None-Match, and GitHub's 304s cost no rate-limit
+# quota and no body download.
+SESSION = requests_cache.CachedSession(
+    ".gh_cache", backend="sqlite", expire_after=3600, cache_control=True)
+SESSION.headers.update({
+    "Accept": "application/vnd.github.v3+json",
+    "User-Agent": "ModelScore-GitHub-Query"
+})
+SESSION.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=20, pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504])))
+
+
+def _auth_headers(token: Optional[str]) -> Dict[str, str]:
+    """Per-call headers on top of the session defaults."""
+    return {"Authorization": f"token {token}"} if token else {}
 
 
 def query_github_repository(gh_model_name: str, token: Optional[str] = None) -> Optional[Dict[Any, Any]]:
     """
     Query the GitHub API for repository information
-    
+
     Args:
         gh_model_name (str): The GitHub repository name in format "owner/repo"
         token (str, optional): GitHub personal access token for higher rate limits
-        
+
     Returns:
         dict: JSON response from the GitHub API, or None if error
     """
     url = f"https://api.github.com/repos/{gh_model_name}"
-    
-    headers = {
-        "Accept": "application/vnd.github.v3+json",
-        "User-Agent": "ModelScore-GitHub-Query"
-    }
-    
-    # Add authorization header if token is provided
-    if token:
-        headers["Authorization"] = f"token {token}"
-    
+
+    headers = _auth_headers(token)
+
     try:
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url, headers=headers, timeout=30)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -41,6 +65,83 @@ def query_github_repository(gh_model_name: str, token: Optional[str] = None) ->
         return None
 
 
+# One GraphQL POST covers the topics, languages and releases that the REST
+# path needs three separate endpoints for, and only transfers the selected
+# fields instead of the full ~40KB repo payloads.
+_ADDITIONAL_INFO_QUERY = """
+query($o: String!, $r: String!) {
+  repository(owner: $o, name: $r) {
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    languages(first: 50) { edges { size node { name } } }
+    releases(first: 1, orderBy: {field: CREATED_AT, direction: DESC}) {
+      totalCount
+      nodes { tagName name createdAt url }
+    }
+  }
+}
+"""
+
+
+def _summarize_contributor_stats(stats: Any) -> Dict[str, Any]:
+    """Reduce /stats/contributors to the aggregates worth keeping.
+
+    The raw response carries a full per-week commit matrix per contributor
+    — megabytes for big repos — and nothing downstream reads it, so only
+    the contributor count and total commits are retained.
+    """
+    if not isinstance(stats, list):
+        return {}
+    return {
+        "contributors_count": len(stats),
+        "contributions_total": sum(c.get("total", 0) for c in stats
+                                   if isinstance(c, dict)),
+    }
+
+
+def _graphql_additional_info(gh_model_name: str, token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Fetch topics/languages/releases in a single GraphQL POST.
+
+    Returns a partial additional_info dict shaped like the REST results,
+    or None to signal the REST fallback (no token, bad repo name, GraphQL
+    errors, or insufficient scope).
+    """
+    if not token or "/" not in gh_model_name:
+        return None
+    owner, repo = gh_model_name.split("/", 1)
+    try:
+        response = SESSION.post(
+            "https://api.github.com/graphql",
+            json={"query": _ADDITIONAL_INFO_QUERY,
+                  "variables": {"o": owner, "r": repo}},
+            headers=_auth_headers(token), timeout=30)
+        if response.status_code != 200:
+            return None
+        payload = response.json()
+    except (requests.exceptions.RequestException, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("errors"):
+        return None
+    node = (payload.get("data") or {}).get("repository")
+    if not node:
+        return None
+
+    info: Dict[str, Any] = {}
+    topics = [n["topic"]["name"]
+              for n in (node.get("repositoryTopics") or {}).get("nodes", [])
+              if n.get("topic")]
+    info["topics"] = {"names": topics}
+    # Same shape as the REST /languages endpoint: {language: bytes}
+    info["languages"] = {e["node"]["name"]: e.get("size")
+                         for e in (node.get("languages") or {}).get("edges", [])
+                         if e.get("node")}
+    releases = node.get("releases") or {}
+    release_nodes = releases.get("nodes") or []
+    info["latest_release"] = release_nodes[0] if release_nodes else None
+    info["total_releases"] = releases.get("totalCount", 0)
+    return info
+
+
 def get_additional_github_info(gh_model_name: str, token: Optional[str] = None) -> Dict[str, Any]:
     """
     Get additional GitHub repository information (commits, issues, etc.)
@@ -52,95 +153,134 @@ def get_additional_github_info(gh_model_name: str, token: Optional[str] = None)
     Returns:
         dict: Additional repository information
     """
-    headers = {
-        "Accept": "application/vnd.github.v3+json",
-        "User-Agent": "ModelScore-GitHub-Query"
-    }
-    
-    if token:
-        headers["Authorization"] = f"token {token}"
-    
+    headers = _auth_headers(token)
+    base_url = f"https://api.github.com/repos/{gh_model_name}"
+
+    def _get(url):
+        return SESSION.get(url, headers=headers, timeout=30)
+
+    # Preferred path: one GraphQL POST for topics/languages/releases, plus
+    # the contributor stats endpoint (GraphQL has no equivalent for it).
+    graphql_info = _graphql_additional_info(gh_model_name, token)
+    if graphql_info is not None:
+        try:
+            response = _get(f"{base_url}/stats/contributors")
+            if response.status_code == 200:
+                graphql_info.update(_summarize_contributor_stats(response.json()))
+        except Exception as e:
+            print(f"Error getting contributor stats: {e}")
+        return graphql_info
+
+    # REST fallback. The four endpoints are independent; fetch them
+    # concurrently so wall time is the slowest round-trip rather than the
+    # sum of four. The shared session keeps them all on pooled keep-alive
+    # connections.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            "contributors_stats": executor.submit(_get, f"{base_url}/stats/contributors"),
+            "topics": executor.submit(_get, f"{base_url}/topics"),
+            "languages": executor.submit(_get, f"{base_url}/languages"),
+            "releases": executor.submit(_get, f"{base_url}/releases"),
+        }
+
     additional_info = {}
-    
+
     # Get repository statistics
     try:
-        stats_url = f"https://api.github.com/repos/{gh_model_name}/stats/contributors"
-        response = requests.get(stats_url, headers=headers)
+        response = futures["contributors_stats"].result()
         if response.status_code == 200:
-            additional_info["contributors_stats"] = response.json()
+            additional_info.update(_summarize_contributor_stats(response.json()))
     except Exception as e:
         print(f"Error getting contributor stats: {e}")
-    
+
     # Get repository topics
     try:
-        topics_url = f"https://api.github.com/repos/{gh_model_name}/topics"
-        response = requests.get(topics_url, headers=headers)
+        response = futures["topics"].result()
         if response.status_code == 200:
             additional_info["topics"] = response.json()
     except Exception as e:
         print(f"Error getting topics: {e}")
-    
+
     # Get repository languages
     try:
-        languages_url = f"https://api.github.com/repos/{gh_model_name}/languages"
-        response = requests.get(languages_url, headers=headers)
+        response = futures["languages"].result()
         if response.status_code == 200:
             additional_info["languages"] = response.json()
     except Exception as e:
         print(f"Error getting languages: {e}")
-    
+
     # Get repository releases
     try:
-        releases_url = f"https://api.github.com/repos/{gh_model_name}/releases"
-        response = requests.get(releases_url, headers=headers)
+        response = futures["releases"].result()
         if response.status_code == 200:
             releases = response.json()
             additional_info["latest_release"] = releases[0] if releases else None
             additional_info["total_releases"] = len(releases)
     except Exception as e:
         print(f"Error getting releases: {e}")
-    
+
     return additional_info
 
 
 
 
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def save_github_info_to_json(github_info: Dict[str, Any], json_file_path: str) -> None:
     """
-    Save GitHub repository information to a JSON file
-    
+    Append GitHub repository information to a JSON-lines file
+
+    One object per line, appended in place: writing N repositories costs
+    O(N) total instead of the old read-modify-rewrite of the whole
+    document on every call, and orjson (when available) does the
+    serialization in C.
+
     Args:
         github_info (dict): GitHub repository information
-        json_file_path (str): Path to the JSON file
+        json_file_path (str): Path to the JSONL file
     """
     if not github_info:
         return
-    
-    # Check if JSON file exists to determine if we should append or create new
-    file_exists = Path(json_file_path).exists()
-    
-    if file_exists:
-        # Read existing JSON data
-        try:
-            with open(json_file_path, 'r', encoding='utf-8') as jsonfile:
-                existing_data = json.load(jsonfile)
-        except (json.JSONDecodeError, FileNotFoundError):
-            # If file is corrupted or empty, start fresh
-            existing_data = {"repositories": []}
-    else:
-        # Create new structure
-        existing_data = {"repositories": []}
-    
-    # Ensure the structure has a repositories list
-    if not isinstance(existing_data, dict) or "repositories" not in existing_data:
-        existing_data = {"repositories": []}
-    
-    # Add new repository information
-    existing_data["repositories"].append(github_info)
-    
-    # Write back to JSON file with pretty formatting
-    with open(json_file_path, 'w', encoding='utf-8') as jsonfile:
-        json.dump(existing_data, jsonfile, indent=2, ensure_ascii=False)
+
+    with open(json_file_path, 'ab') as jsonfile:
+        jsonfile.write(_dumps(github_info))
+        jsonfile.write(b'\n')
+
+
+def read_all_github_info(json_file_path: str) -> Dict[str, Any]:
+    """
+    Stream the JSONL file back as {"repositories": [...]}, the shape the
+    old accumulating JSON document used
+
+    Args:
+        json_file_path (str): Path to the JSONL file
+
+    Returns:
+        dict: All saved repository records
+    """
+    repositories = []
+    try:
+        with open(json_file_path, 'rb') as jsonfile:
+            for line in jsonfile:
+                line = line.strip()
+                if line:
+                    try:
+                        repositories.append(_loads(line))
+                    except ValueError:
+                        continue  # Skip corrupted lines
+    except FileNotFoundError:
+        pass
+    return {"repositories": repositories}
 
 
 def main():
@@ -174,8 +314,8 @@ def main():
         all_info = {**repo_info, **additional_info}
         
         # Save to JSON file
-        save_github_info_to_json(all_info, 'GH_response.json')
-        print("GitHub repository information saved to GH_response.json")
+        save_github_info_to_json(all_info, 'GH_response.jsonl')
+        print("GitHub repository information saved to GH_response.jsonl")
         
         # Print some key information
         print(f"Repository: {repo_info.get('full_name', 'N/A')}")
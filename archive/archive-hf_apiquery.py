@@ -6,12 +6,13 @@ Hugging Face Hub client library example for querying models
 from huggingface_hub import HfApi, HfFolder
 import os
 
+# Single client instance so every query in the process shares one pooled
+# requests.Session (and reads HF_TOKEN from the environment only once)
+api = HfApi(token=os.getenv("HF_TOKEN"))
+
 def query_huggingface_models():
     """Query Hugging Face models using the client library"""
-    
-    # Initialize the Hugging Face API client
-    api = HfApi()
-    
+
     try:
         # List some popular models
         print("Popular Models:")
@@ -16,45 +16,126 @@ based on the model names (slashes replaced with underscores) containing
 all available repository card data.
 """
 
+import concurrent.futures
 import json
 import os
 import sys
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, Tuple
+import requests
+import yaml
 from huggingface_hub import RepoCard
 
+try:
+    import orjson  # C serializer; writes the whole document in one call
+except ImportError:
+    orjson = None
+
+# On-disk TTL cache so repeat runs over the same models skip the network.
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "model_scores", ".cache")
+CACHE_TTL_SECONDS = 3600
+
+
+def _cache_path(model_name: str) -> str:
+    return os.path.join(CACHE_DIR, model_name.replace("/", "_") + "_card.json")
+
+
+def _cache_get(model_name: str) -> Optional[Dict[Any, Any]]:
+    """Return cached card data for the model if present and fresh, else None."""
+    try:
+        with open(_cache_path(model_name), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        if time.time() - entry.get("ts", 0) <= CACHE_TTL_SECONDS:
+            return entry.get("data")
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _cache_put(model_name: str, data: Dict[Any, Any]) -> None:
+    """Store card data for the model with a timestamp; failures are non-fatal."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_cache_path(model_name), 'w', encoding='utf-8') as f:
+            json.dump({"ts": time.time(), "data": data}, f)
+    except OSError:
+        pass
+
+
+def _load_card_fast(model_name: str) -> Optional[Tuple[Dict[Any, Any], str, str]]:
+    """
+    Fetch the raw README and slice out its YAML front-matter directly.
+
+    Only the front-matter feeds the downstream card data, so there is no
+    need for RepoCard's full Markdown parse. Returns
+    (front_matter, body_text, full_text) or None if the fetch failed.
+    """
+    url = f"https://huggingface.co/{model_name}/raw/main/README.md"
+    try:
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+    except requests.exceptions.RequestException:
+        return None
+
+    text = response.text
+    front_matter: Dict[Any, Any] = {}
+    body = text
+    if text.startswith("---"):
+        end = text.find("\n---", 3)
+        if end != -1:
+            try:
+                front_matter = yaml.safe_load(text[3:end + 1]) or {}
+            except yaml.YAMLError:
+                front_matter = {}
+            body = text[end + 4:].lstrip("\n")
+    if not isinstance(front_matter, dict):
+        front_matter = {}
+    return front_matter, body, text
+
 
 def query_repository_card(model_name: str) -> Optional[Dict[Any, Any]]:
     """
     Query the HuggingFace repository card for model information.
-    
+
     Args:
         model_name: The HuggingFace model ID (e.g., "meta-llama/Llama-4-Scout-17B-16E-Instruct")
-        
+
     Returns:
         Dictionary containing repository card information, or None if query failed
     """
+    # Serve from the disk cache when fresh
+    cached = _cache_get(model_name)
+    if cached is not None:
+        print(f"Using cached repository card for model: {model_name}")
+        return cached
+
     try:
         print(f"Querying HuggingFace repository card: {model_name}")
-        
-        # Load the repository card
-        card = RepoCard.load(model_name)
-        
-        # Extract all available data from the card
-        card_data = {
-            "model_name": model_name,
-            "card_data": card.data.to_dict() if card.data else {},
-            "card_text": card.text,
-            "card_content": card.content,
-            "metadata": {}
-        }
-        
-        # Add metadata if available
-        if hasattr(card.data, '__dict__'):
-            card_data["metadata"] = card.data.__dict__
-        
+
+        # Fast path: raw README + front-matter slice, no RepoCard machinery
+        fast = _load_card_fast(model_name)
+        if fast is not None:
+            front_matter, body, full_text = fast
+            card_data = {
+                "model_name": model_name,
+                "card_data": front_matter,
+                "card_text": body,
+                "card_content": full_text
+            }
+        else:
+            # Fall back to the hub client (e.g. non-main default branch)
+            card = RepoCard.load(model_name)
+            card_data = {
+                "model_name": model_name,
+                "card_data": card.data.to_dict() if card.data else {},
+                "card_text": card.text,
+                "card_content": card.content
+            }
+
         print(f"Successfully retrieved repository card for model: {model_name}")
+        _cache_put(model_name, card_data)
         return card_data
-        
+
     except Exception as e:
         print(f"Error loading repository card: {e}")
         return None
@@ -80,10 +161,16 @@ def save_card_data_to_json(model_name: str, card_data: Dict[Any, Any]) -> Option
         filename = model_name.replace("/", "_") + "_card.json"
         file_path = os.path.join(model_scores_dir, filename)
         
-        # Save data to JSON file with pretty formatting
-        with open(file_path, 'w', encoding='utf-8') as json_file:
-            json.dump(card_data, json_file, indent=2, ensure_ascii=False)
-        
+        # Save data to JSON file with pretty formatting; orjson serializes to
+        # bytes up front so the file is written in a single call
+        if orjson is not None:
+            with open(file_path, 'wb') as json_file:
+                json_file.write(orjson.dumps(
+                    card_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as json_file:
+                json.dump(card_data, json_file, indent=2, ensure_ascii=False)
+
         print(f"Repository card data saved to: {file_path}")
         return file_path
         
@@ -130,21 +217,17 @@ def main():
         print("Example: python hf_cards.py google-bert/bert-base-uncased")
         sys.exit(1)
     
-    # Process each model name provided as command line arguments
-    success_count = 0
-    total_count = len(sys.argv) - 1
-    
-    for i in range(1, len(sys.argv)):
-        model_name = sys.argv[i]
-        print(f"\n{'='*60}")
-        print(f"Processing repository card {i}/{total_count}: {model_name}")
-        print(f"{'='*60}")
-        
-        if query_and_save_card(model_name):
-            success_count += 1
-        else:
-            print(f"Failed to process repository card for model: {model_name}")
-    
+    # Process the repository cards concurrently; each worker's prints carry
+    # the model name, so interleaved output stays attributable.
+    model_names = sys.argv[1:]
+    total_count = len(model_names)
+    print(f"Processing {total_count} repository cards...")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, total_count)) as executor:
+        results = list(executor.map(query_and_save_card, model_names))
+
+    success_count = sum(1 for ok in results if ok)
+
     # Print summary
     print(f"\n{'='*60}")
     print(f"Processing complete: {success_count}/{total_count} repository cards processed successfully")
@@ -14,40 +14,91 @@ The script will create JSON files in the model_scores folder with filenames
 based on the model names (slashes replaced with underscores).
 """
 
+import concurrent.futures
 import requests
 import json
 import os
 import sys
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, Tuple
 from urllib.parse import quote
 
+try:
+    import orjson  # C serializer; writes the whole document in one call
+except ImportError:
+    orjson = None
 
-def query_huggingface_model(model_name: str) -> Optional[Dict[Any, Any]]:
+# Shared session: keep-alive reuses the TLS connection to huggingface.co
+# across models, and the pool size matches the thread-pool worker count.
+_HF_SESSION = requests.Session()
+_HF_SESSION.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=8, pool_maxsize=8))
+
+# On-disk TTL cache so repeat runs over the same models skip the network.
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "model_scores", ".cache")
+CACHE_TTL_SECONDS = 3600
+
+
+def _cache_path(model_name: str) -> str:
+    return os.path.join(CACHE_DIR, model_name.replace("/", "_") + ".json")
+
+
+def _cache_get(model_name: str) -> Optional[Dict[Any, Any]]:
+    """Return cached data for the model if present and fresh, else None."""
+    try:
+        with open(_cache_path(model_name), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        if time.time() - entry.get("ts", 0) <= CACHE_TTL_SECONDS:
+            return entry.get("data")
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _cache_put(model_name: str, data: Dict[Any, Any]) -> None:
+    """Store data for the model with a timestamp; failures are non-fatal."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_cache_path(model_name), 'w', encoding='utf-8') as f:
+            json.dump({"ts": time.time(), "data": data}, f)
+    except OSError:
+        pass
+
+
+def query_huggingface_model(model_name: str) -> Optional[Tuple[Optional[bytes], Dict[Any, Any]]]:
     """
     Query the HuggingFace web API for model information.
-    
+
     Args:
         model_name: The HuggingFace model ID (e.g., "meta-llama/Llama-4-Scout-17B-16E-Instruct")
-        
+
     Returns:
-        Dictionary containing model information, or None if query failed
+        Tuple of (raw response bytes, model information dict), or None if the
+        query failed. The raw bytes are None when served from the disk cache.
     """
+    # Serve from the disk cache when fresh
+    cached = _cache_get(model_name)
+    if cached is not None:
+        print(f"Using cached data for model: {model_name}")
+        return None, cached
+
     # Construct the API URL
     api_url = f"https://huggingface.co/api/models/{quote(model_name)}"
-    
+
     try:
         print(f"Querying HuggingFace API: {api_url}")
-        
+
         # Make the API request
-        response = requests.get(api_url, timeout=30)
+        response = _HF_SESSION.get(api_url, timeout=30)
         response.raise_for_status()  # Raise an exception for bad status codes
-        
+
         # Parse JSON response
         model_data = response.json()
-        
+
         print(f"Successfully retrieved data for model: {model_name}")
-        return model_data
-        
+        _cache_put(model_name, model_data)
+        return response.content, model_data
+
     except requests.exceptions.RequestException as e:
         print(f"Error making API request: {e}")
         return None
@@ -79,10 +130,16 @@ def save_model_data_to_json(model_name: str, model_data: Dict[Any, Any]) -> Opti
         filename = model_name.replace("/", "_") + ".json"
         file_path = os.path.join(model_scores_dir, filename)
         
-        # Save data to JSON file with pretty formatting
-        with open(file_path, 'w', encoding='utf-8') as json_file:
-            json.dump(model_data, json_file, indent=2, ensure_ascii=False)
-        
+        # Save data to JSON file with pretty formatting; orjson serializes to
+        # bytes up front so the file is written in a single call
+        if orjson is not None:
+            with open(file_path, 'wb') as json_file:
+                json_file.write(orjson.dumps(
+                    model_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as json_file:
+                json.dump(model_data, json_file, indent=2, ensure_ascii=False)
+
         print(f"Model data saved to: {file_path}")
         return file_path
         
@@ -91,25 +148,62 @@ def save_model_data_to_json(model_name: str, model_data: Dict[Any, Any]) -> Opti
         return None
 
 
+def save_raw_bytes(model_name: str, content: bytes) -> Optional[str]:
+    """
+    Persist the API response bytes verbatim, with no parse/re-serialize pass.
+
+    Args:
+        model_name: The HuggingFace model ID
+        content: Raw response body as returned by the API
+
+    Returns:
+        Path to the saved file, or None if save failed
+    """
+    try:
+        # Create model_scores directory if it doesn't exist
+        model_scores_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "model_scores")
+        os.makedirs(model_scores_dir, exist_ok=True)
+
+        # Create filename from model name (replace slashes with underscores)
+        filename = model_name.replace("/", "_") + ".json"
+        file_path = os.path.join(model_scores_dir, filename)
+
+        with open(file_path, 'wb') as json_file:
+            json_file.write(content)
+
+        print(f"Model data saved to: {file_path}")
+        return file_path
+
+    except Exception as e:
+        print(f"Error saving JSON file: {e}")
+        return None
+
+
 def query_and_save_model(model_name: str) -> bool:
     """
     Query HuggingFace API for a model and save the results as JSON.
-    
+
     Args:
         model_name: The HuggingFace model ID
-        
+
     Returns:
         True if successful, False otherwise
     """
     # Query the model data
-    model_data = query_huggingface_model(model_name)
-    
-    if model_data is None:
+    result = query_huggingface_model(model_name)
+
+    if result is None:
         print(f"Failed to retrieve data for model: {model_name}")
         return False
-    
-    # Save the data to JSON
-    saved_path = save_model_data_to_json(model_name, model_data)
+
+    raw_content, model_data = result
+
+    # Save the data to JSON. Fresh responses are written as the exact bytes
+    # the API sent; only cache hits need re-serialization.
+    if raw_content is not None:
+        saved_path = save_raw_bytes(model_name, raw_content)
+    else:
+        saved_path = save_model_data_to_json(model_name, model_data)
     
     if saved_path is None:
         print(f"Failed to save data for model: {model_name}")
@@ -128,21 +222,17 @@ def main():
         print("Example: python hf_webquery.py meta-llama/Llama-4-Scout-17B-16E-Instruct")
         sys.exit(1)
     
-    # Process each model name provided as command line arguments
-    success_count = 0
-    total_count = len(sys.argv) - 1
-    
-    for i in range(1, len(sys.argv)):
-        model_name = sys.argv[i]
-        print(f"\n{'='*60}")
-        print(f"Processing model {i}/{total_count}: {model_name}")
-        print(f"{'='*60}")
-        
-        if query_and_save_model(model_name):
-            success_count += 1
-        else:
-            print(f"Failed to process model: {model_name}")
-    
+    # Process the models concurrently; each worker's prints carry the model
+    # name, so interleaved output stays attributable.
+    model_names = sys.argv[1:]
+    total_count = len(model_names)
+    print(f"Processing {total_count} models...")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, total_count)) as executor:
+        results = list(executor.map(query_and_save_model, model_names))
+
+    success_count = sum(1 for ok in results if ok)
+
     # Print summary
     print(f"\n{'='*60}")
     print(f"Processing complete: {success_count}/{total_count} models processed successfully")
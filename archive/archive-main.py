@@ -9,6 +9,11 @@ import csv
 import sys
 import requests
 
+# One client for the module: HfApi keeps a requests.Session internally,
+# so hoisting the instance reuses pooled connections across calls and
+# pays the env/token setup once
+api = HfApi()
+
 def main():
     """Main function"""
     model_name = None
@@ -21,9 +26,6 @@ def main():
     
     print(f"Querying model: {model_name}")
     
-    # Initialize the Hugging Face API client
-    api = HfApi()
-    
     try:
         # Query specific model information
         info = api.model_info(model_name)
@@ -6,28 +6,64 @@ Queries both HuggingFace and GitHub for model information using the model mappin
 and outputs results to an Excel file with separate tabs.
 """
 
+import concurrent.futures
 import csv
 import os
 import sys
+import threading
 import time
 import requests
+import requests_cache
 from typing import Dict, List, Tuple, Optional, Any
 from urllib.parse import quote
 import json
 import pandas as pd
-from huggingface_hub import HfApi
+from datetime import datetime
+from openpyxl import Workbook
+from urllib3.util.retry import Retry
 
-# GitHub API configuration
+# GitHub API configuration. The session persists responses to a local
+# sqlite cache and, with cache_control=True, revalidates stale entries via
+# ETag/If-None-Match — a 304 carries no body and does not count against the
+# rate limit, so repeat runs over unchanged repos are nearly free.
 API_ROOT = "https://api.github.com"
-SESSION = requests.Session()
+SESSION = requests_cache.CachedSession(
+    "gh_cache", expire_after=3600, backend="sqlite", cache_control=True)
 SESSION.headers.update({
     "Accept": "application/vnd.github+json",
     "User-Agent": "model-scoring-query/1.0"
 })
+# Transient failures (429/5xx, connection resets) retry inside urllib3 with
+# exponential backoff plus jitter, honoring Retry-After; _req only has to
+# deal with GitHub's 403 rate-limit convention. The pool is sized past the
+# 20-worker fan-out so no thread blocks waiting for a free connection
+# (requests defaults to 10 per host).
+_ADAPTER = requests.adapters.HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        backoff_jitter=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+    ))
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
 TOKEN = os.getenv("GITHUB_TOKEN")
 if TOKEN:
     SESSION.headers.update({"Authorization": f"Bearer {TOKEN}"})
 
+# HuggingFace API configuration: a plain GET against the models endpoint
+# returns the same payload HfApi.model_info() builds, minus the client-side
+# object construction.
+HF_API_ROOT = "https://huggingface.co/api"
+HF_SESSION = requests.Session()
+HF_SESSION.headers.update({"User-Agent": "model-scoring-query/1.0"})
+HF_TOKEN = os.getenv("HF_TOKEN")
+if HF_TOKEN:
+    HF_SESSION.headers.update({"Authorization": f"Bearer {HF_TOKEN}"})
+
 
 def parse_model_mapping(file_path: str) -> List[Tuple[str, str]]:
     """Parse the model mapping file to extract HuggingFace and GitHub model IDs.
@@ -38,41 +74,74 @@ def parse_model_mapping(file_path: str) -> List[Tuple[str, str]]:
     Returns:
         List of tuples containing (huggingface_id, github_id)
     """
-    model_mappings = []
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if not line or line.startswith('#'):  # Skip empty lines and comments
-                continue
-                
-            if ',' not in line:
-                print(f"Warning: Line {line_num} doesn't contain a comma, skipping: {line}")
-                continue
-                
-            try:
-                huggingface_id, github_id = line.split(',', 1)
-                huggingface_id = huggingface_id.strip()
-                github_id = github_id.strip()
-                
-                if huggingface_id and github_id:
-                    model_mappings.append((huggingface_id, github_id))
-                else:
-                    print(f"Warning: Empty IDs on line {line_num}, skipping: {line}")
-            except ValueError as e:
-                print(f"Error parsing line {line_num}: {e}")
-                
-    return model_mappings
+    # read_csv does the strip/split work in vectorized C; comments, blank
+    # lines and rows missing either column are dropped in bulk.
+    df = pd.read_csv(
+        file_path, names=["hf", "gh"], comment="#", skip_blank_lines=True,
+        dtype=str, skipinitialspace=True, usecols=[0, 1],
+        on_bad_lines="skip", encoding="utf-8")
+    valid = df.dropna()
+
+    skipped = len(df) - len(valid)
+    if skipped:
+        print(f"Warning: skipped {skipped} malformed line(s) in {file_path}")
+
+    return [(hf.strip(), gh.strip()) for hf, gh in
+            valid.itertuples(index=False, name=None)]
+
+
+class RateLimitError(Exception):
+    """Raised when the GitHub rate limit is exhausted for longer than we
+    are willing to block a worker; carries the reset time so callers can
+    schedule resumption."""
+
+    def __init__(self, reset_at: int):
+        self.reset_at = reset_at
+        super().__init__(f"GitHub rate limit exhausted until epoch {reset_at}")
+
+
+# Reactive pacing: track X-RateLimit-Remaining/-Reset from every response
+# and slow down before GitHub starts rejecting requests.
+_RATE = {"remaining": 5000, "reset": 0}
+_rate_lock = threading.Lock()
+_RATE_THRESHOLD = 50
+
+
+def _update_rate(resp: requests.Response) -> None:
+    remaining = resp.headers.get("X-RateLimit-Remaining")
+    if remaining is None:
+        return
+    with _rate_lock:
+        try:
+            _RATE["remaining"] = int(remaining)
+            _RATE["reset"] = int(resp.headers.get("X-RateLimit-Reset") or 0)
+        except ValueError:
+            pass
+
+
+def _pace() -> None:
+    """Sleep until reset when the remaining budget is nearly gone."""
+    with _rate_lock:
+        remaining, reset = _RATE["remaining"], _RATE["reset"]
+    if remaining < _RATE_THRESHOLD:
+        sleep_for = reset - time.time() + 1
+        if sleep_for > 0:
+            time.sleep(min(sleep_for, 60))
 
 
 def _req(method: str, url: str, **kwargs) -> requests.Response:
     """HTTP wrapper with minimal rate-limit backoff."""
     for _ in range(3):
+        _pace()
         resp = SESSION.request(method, url, timeout=30, **kwargs)
+        _update_rate(resp)
         if resp.status_code == 403 and resp.headers.get("X-RateLimit-Remaining") == "0":
             reset_epoch = int(resp.headers.get("X-RateLimit-Reset", "0") or 0)
             sleep_for = max(0, reset_epoch - int(time.time()) + 1)
-            time.sleep(min(sleep_for, 60))
+            if sleep_for > 60:
+                # Don't tie up a worker for minutes; let the caller decide.
+                raise RateLimitError(reset_at=reset_epoch)
+            time.sleep(sleep_for)
             continue
         return resp
     return resp
@@ -93,54 +162,78 @@ def safe_get_json(url: str, params: Optional[Dict[str, Any]] = None) -> Tuple[An
         return None, resp.status_code, msg
 
 
+_SCALARS = (str, int, float, bool)
+
+
 def _flatten(prefix: str, obj: Any) -> List[Tuple[str, str]]:
-    """Flatten nested dict/list into dot/bracket path keys to string values."""
-    def _to_str(val: Any) -> str:
-        if val is None or isinstance(val, (str, int, float, bool)):
-            return str(val)
-        return json.dumps(val, ensure_ascii=False)
-
-    result = []
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            new_prefix = f"{prefix}.{k}" if prefix else str(k)
-            result.extend(_flatten(new_prefix, v))
-    elif isinstance(obj, list):
-        for i, v in enumerate(obj):
-            new_prefix = f"{prefix}[{i}]" if prefix else f"[{i}]"
-            result.extend(_flatten(new_prefix, v))
-    else:
-        result.append((prefix, _to_str(obj)))
-    
+    """Flatten nested dict/list into dot/bracket path keys to string values.
+
+    Iterative: an explicit stack replaces recursion, avoiding a Python
+    frame and a result-list merge per node on deep GitHub payloads.
+    Children are pushed in reverse so output order matches the old
+    recursive traversal.
+    """
+    result: List[Tuple[str, str]] = []
+    stack: List[Tuple[str, Any]] = [(prefix, obj)]
+    while stack:
+        prefix, obj = stack.pop()
+        if isinstance(obj, dict):
+            for k, v in reversed(list(obj.items())):
+                stack.append((f"{prefix}.{k}" if prefix else str(k), v))
+        elif isinstance(obj, list):
+            for i in range(len(obj) - 1, -1, -1):
+                stack.append((f"{prefix}[{i}]" if prefix else f"[{i}]", obj[i]))
+        elif obj is None or isinstance(obj, _SCALARS):
+            result.append((prefix, str(obj)))
+        else:
+            result.append((prefix, json.dumps(obj, ensure_ascii=False)))
+
     return result
 
 
+# Successful lookups only: an error dict from a transient failure must
+# not be pinned for the process (lru_cache would memoize it), so failed
+# models re-probe on the next call.
+_HF_MODEL_CACHE_MAXSIZE = 4096
+_hf_model_cache: Dict[str, Dict[str, Any]] = {}
+
+
 def query_huggingface_model(model_id: str) -> Dict[str, Any]:
     """Query HuggingFace for model information.
-    
+
+    Memoized: mapping files can list the same model several times, and the
+    cache collapses those into one API request per process. Only
+    'status': 'success' results are cached — errors are returned but not
+    remembered, so a retry gets a fresh request.
+
     Args:
         model_id: HuggingFace model ID
-        
+
     Returns:
         Dictionary containing model information
     """
+    cached = _hf_model_cache.get(model_id)
+    if cached is not None:
+        return cached
     try:
-        api = HfApi()
-        model_info = api.model_info(model_id, securityStatus=True)
-        
-        # Convert model info to dictionary format
+        url = f"{HF_API_ROOT}/models/{quote(model_id, safe='/')}"
+        resp = HF_SESSION.get(url, params={"securityStatus": "true"}, timeout=30)
+        resp.raise_for_status()
+        info = resp.json()
+
+        # Pick out the key fields straight from the JSON payload
         model_data = {
             'model_id': model_id,
             'status': 'success'
         }
-        
-        # Extract key information from model_info object
-        for key, value in model_info.__dict__.items():
-            if key in ['id', 'sha', 'lastModified', 'tags', 'downloads', 'likes', 'library_name', 'pipeline_tag']:
-                model_data[key] = value
-        
+        for key in ['id', 'sha', 'lastModified', 'tags', 'downloads', 'likes', 'library_name', 'pipeline_tag']:
+            if key in info:
+                model_data[key] = info[key]
+
+        if len(_hf_model_cache) < _HF_MODEL_CACHE_MAXSIZE:
+            _hf_model_cache[model_id] = model_data
         return model_data
-        
+
     except Exception as e:
         return {
             'model_id': model_id,
@@ -149,6 +242,132 @@ def query_huggingface_model(model_id: str) -> Dict[str, Any]:
         }
 
 
+# One GraphQL POST returns the repo metadata, topics and languages that
+# otherwise cost three REST round-trips (and three rate-limit points).
+_REPO_QUERY = """
+query($o: String!, $r: String!) {
+  repository(owner: $o, name: $r) {
+    databaseId
+    name
+    nameWithOwner
+    description
+    url
+    createdAt
+    updatedAt
+    pushedAt
+    diskUsage
+    stargazerCount
+    forkCount
+    isArchived
+    isDisabled
+    isPrivate
+    isFork
+    hasIssuesEnabled
+    hasProjectsEnabled
+    hasWikiEnabled
+    primaryLanguage { name }
+    defaultBranchRef { name }
+    watchers { totalCount }
+    issues(states: OPEN) { totalCount }
+    owner { login url __typename }
+    repositoryTopics(first: 25) { nodes { topic { name } } }
+    languages(first: 20) { nodes { name } }
+  }
+}
+"""
+
+
+def _graphql_repo(owner: str, repo: str) -> Optional[Dict[str, Any]]:
+    """Fetch one repository node via GraphQL; None means fall back to REST.
+
+    GraphQL requires a token, so anonymous runs skip straight to REST.
+    """
+    if not TOKEN:
+        return None
+    try:
+        resp = _req("POST", f"{API_ROOT}/graphql",
+                    json={"query": _REPO_QUERY,
+                          "variables": {"o": owner, "r": repo}})
+        if resp.status_code != 200:
+            return None
+        payload = resp.json()
+    except (requests.RequestException, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("errors"):
+        return None
+    return (payload.get("data") or {}).get("repository")
+
+
+def _repo_data_from_graphql(owner: str, repo: str, node: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a GraphQL repository node onto the REST-shaped result dict."""
+    primary_lang = node.get('primaryLanguage') or {}
+    default_branch = node.get('defaultBranchRef') or {}
+    owner_node = node.get('owner') or {}
+    topics = [n['topic']['name']
+              for n in (node.get('repositoryTopics') or {}).get('nodes', [])
+              if n.get('topic')]
+    languages = [n['name']
+                 for n in (node.get('languages') or {}).get('nodes', [])]
+    return {
+        'owner': owner,
+        'repo': repo,
+        'status': 'success',
+        'repo_id': node.get('databaseId'),
+        'repo_name': node.get('name'),
+        'repo_full_name': node.get('nameWithOwner'),
+        'repo_description': node.get('description'),
+        'repo_html_url': node.get('url'),
+        'repo_created_at': node.get('createdAt'),
+        'repo_updated_at': node.get('updatedAt'),
+        'repo_pushed_at': node.get('pushedAt'),
+        'repo_size': node.get('diskUsage'),
+        'repo_stargazers_count': node.get('stargazerCount'),
+        'repo_watchers_count': (node.get('watchers') or {}).get('totalCount'),
+        'repo_forks_count': node.get('forkCount'),
+        'repo_open_issues_count': (node.get('issues') or {}).get('totalCount'),
+        'repo_language': primary_lang.get('name'),
+        'repo_archived': node.get('isArchived'),
+        'repo_disabled': node.get('isDisabled'),
+        'repo_private': node.get('isPrivate'),
+        'repo_fork': node.get('isFork'),
+        'repo_has_issues': node.get('hasIssuesEnabled'),
+        'repo_has_projects': node.get('hasProjectsEnabled'),
+        'repo_has_wiki': node.get('hasWikiEnabled'),
+        'repo_default_branch': default_branch.get('name'),
+        'repo_topics': topics,
+        'owner_login': owner_node.get('login'),
+        'owner_type': owner_node.get('__typename'),
+        'owner_html_url': owner_node.get('url'),
+        'topics': ', '.join(topics),
+        'languages': ', '.join(sorted(languages)),
+    }
+
+
+# Same success-only policy as the model cache: a failed owner lookup
+# returns {} but is not remembered, so the next repo under that owner
+# retries instead of inheriting the failure.
+_OWNER_CACHE_MAXSIZE = 1024
+_owner_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def _fetch_owner(owner: str) -> Dict[str, Any]:
+    """Fetch owner metadata once per owner.
+
+    Mapped models frequently share an owner (e.g. meta-llama/...), and the
+    owner payload is identical across all of that owner's repos, so the
+    cache collapses those lookups to one request per process.
+    """
+    cached = _owner_cache.get(owner)
+    if cached is not None:
+        return cached
+    owner_json, _, _ = safe_get_json(f"{API_ROOT}/users/{quote(owner)}")
+    if isinstance(owner_json, dict):
+        if len(_owner_cache) < _OWNER_CACHE_MAXSIZE:
+            _owner_cache[owner] = owner_json
+        return owner_json
+    return {}
+
+
 def query_github_repo(owner: str, repo: str) -> Dict[str, Any]:
     """Query GitHub for repository information.
     
@@ -160,10 +379,23 @@ def query_github_repo(owner: str, repo: str) -> Dict[str, Any]:
         Dictionary containing repository information
     """
     try:
-        # Repository core information
+        # Preferred path: one GraphQL POST covers repo + topics + languages
+        node = _graphql_repo(owner, repo)
+        if node is not None:
+            return _repo_data_from_graphql(owner, repo, node)
+
+        # REST fallback (no token, GraphQL errors, or repos it can't serve).
+        # The three endpoints are independent; fetch them concurrently so a
+        # repo costs ~one round-trip instead of three.
         repo_url = f"{API_ROOT}/repos/{owner}/{repo}"
-        repo_json, code, err = safe_get_json(repo_url)
-        
+        topics_url = f"{API_ROOT}/repos/{owner}/{repo}/topics"
+        langs_url = f"{API_ROOT}/repos/{owner}/{repo}/languages"
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+            repo_future = executor.submit(safe_get_json, repo_url)
+            topics_future = executor.submit(safe_get_json, topics_url)
+            langs_future = executor.submit(safe_get_json, langs_url)
+        repo_json, code, err = repo_future.result()
+
         if not repo_json:
             return {
                 'owner': owner,
@@ -180,34 +412,35 @@ def query_github_repo(owner: str, repo: str) -> Dict[str, Any]:
         }
         
         # Extract key repository information
-        key_fields = [
+        key_fields = {
             'id', 'name', 'full_name', 'description', 'html_url', 'clone_url',
             'created_at', 'updated_at', 'pushed_at', 'size', 'stargazers_count',
             'watchers_count', 'forks_count', 'open_issues_count', 'language',
             'has_issues', 'has_projects', 'has_downloads', 'has_wiki',
             'has_pages', 'archived', 'disabled', 'private', 'fork',
             'default_branch', 'topics'
-        ]
-        
-        for field in key_fields:
-            if field in repo_json:
-                repo_data[f'repo_{field}'] = repo_json[field]
+        }
+
+        # json_normalize flattens the whole payload to dotted keys in one
+        # vectorized pass; keep only the curated field set from it
+        flat = pd.json_normalize(repo_json, sep='.').iloc[0].to_dict()
+        repo_data.update({f'repo_{key}': value for key, value in flat.items()
+                          if key.split('.', 1)[0] in key_fields})
         
-        # Get owner information
-        owner_info = repo_json.get('owner', {})
+        # Get owner information from the per-owner cache rather than
+        # re-reading it out of every repo payload
+        owner_info = _fetch_owner(owner) or repo_json.get('owner', {})
         if owner_info:
             for key in ['login', 'id', 'type', 'html_url']:
                 if key in owner_info:
                     repo_data[f'owner_{key}'] = owner_info[key]
         
         # Get additional repository data (non-fatal)
-        topics_url = f"{API_ROOT}/repos/{owner}/{repo}/topics"
-        topics_json, _, _ = safe_get_json(topics_url)
+        topics_json, _, _ = topics_future.result()
         if isinstance(topics_json, dict):
             repo_data['topics'] = ', '.join(topics_json.get("names", []))
-        
-        langs_url = f"{API_ROOT}/repos/{owner}/{repo}/languages"
-        langs_json, _, _ = safe_get_json(langs_url)
+
+        langs_json, _, _ = langs_future.result()
         if isinstance(langs_json, dict):
             repo_data['languages'] = ', '.join(sorted(langs_json.keys()))
         
@@ -222,74 +455,94 @@ def query_github_repo(owner: str, repo: str) -> Dict[str, Any]:
         }
 
 
+def _query_github_mapping(gh_id: str) -> Dict[str, Any]:
+    """Query GitHub for one mapping entry, handling malformed IDs."""
+    if '/' in gh_id:
+        owner, repo = gh_id.split('/', 1)
+        return query_github_repo(owner, repo)
+    print(f"  Warning: Invalid GitHub ID format: {gh_id}")
+    return {
+        'owner': 'unknown',
+        'repo': 'unknown',
+        'status': 'error',
+        'error_message': f"Invalid GitHub ID format: {gh_id}"
+    }
+
+
 def query_all_models(model_mappings: List[Tuple[str, str]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """Query both HuggingFace and GitHub for all models in the mapping.
-    
+
+    The work is entirely network-bound, so both queries for every mapping
+    are submitted to one thread pool and gathered as they complete; results
+    are slotted by index to preserve input order.
+
     Args:
         model_mappings: List of (huggingface_id, github_id) tuples
-        
+
     Returns:
         Tuple of (huggingface_results, github_results)
     """
-    huggingface_results = []
-    github_results = []
-    
+    huggingface_results: List[Optional[Dict[str, Any]]] = [None] * len(model_mappings)
+    github_results: List[Optional[Dict[str, Any]]] = [None] * len(model_mappings)
+
     print(f"Querying {len(model_mappings)} models...")
-    
-    for i, (hf_id, gh_id) in enumerate(model_mappings, 1):
-        print(f"Processing {i}/{len(model_mappings)}: {hf_id} -> {gh_id}")
-        
-        # Query HuggingFace
-        print(f"  Querying HuggingFace: {hf_id}")
-        hf_result = query_huggingface_model(hf_id)
-        huggingface_results.append(hf_result)
-        
-        # Parse GitHub owner/repo from the ID
-        if '/' in gh_id:
-            owner, repo = gh_id.split('/', 1)
-            print(f"  Querying GitHub: {owner}/{repo}")
-            gh_result = query_github_repo(owner, repo)
-            github_results.append(gh_result)
-        else:
-            print(f"  Warning: Invalid GitHub ID format: {gh_id}")
-            github_results.append({
-                'owner': 'unknown',
-                'repo': 'unknown',
-                'status': 'error',
-                'error_message': f"Invalid GitHub ID format: {gh_id}"
-            })
-        
-        # Add a small delay to be respectful to APIs
-        time.sleep(0.5)
-    
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+        hf_futures = {executor.submit(query_huggingface_model, hf_id): idx
+                      for idx, (hf_id, _) in enumerate(model_mappings)}
+        gh_futures = {executor.submit(_query_github_mapping, gh_id): idx
+                      for idx, (_, gh_id) in enumerate(model_mappings)}
+        all_futures = {**hf_futures, **gh_futures}
+        for future in concurrent.futures.as_completed(all_futures):
+            if future in hf_futures:
+                huggingface_results[hf_futures[future]] = future.result()
+            else:
+                github_results[gh_futures[future]] = future.result()
+
     return huggingface_results, github_results
 
 
+def _excel_value(value: Any) -> Any:
+    """Convert only the values openpyxl cannot store as-is: containers are
+    serialized and tz-aware datetimes are safest written as text."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
 def export_to_excel(hf_results: List[Dict[str, Any]], gh_results: List[Dict[str, Any]], output_file: str):
     """Export results to Excel file with separate tabs.
-    
+
     Args:
         hf_results: HuggingFace query results
         gh_results: GitHub query results
         output_file: Output Excel file path
     """
     print(f"Exporting results to {output_file}...")
-    
-    # Convert to DataFrames
-    hf_df = pd.DataFrame(hf_results)
-    gh_df = pd.DataFrame(gh_results)
-    
-    # Handle datetime columns that might have timezone info
-    for df in [hf_df, gh_df]:
-        for col in df.columns:
-            # Convert all values to strings to avoid datetime timezone issues
-            df[col] = df[col].astype(str)
-    
-    # Write to Excel with separate sheets
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-        hf_df.to_excel(writer, sheet_name='HuggingFace', index=False)
-        gh_df.to_excel(writer, sheet_name='GitHub', index=False)
-    
+
+    # Stream rows straight into a write-only workbook: no DataFrame round
+    # trip and no in-memory worksheet tree, so peak memory stays flat
+    # regardless of mapping size.
+    workbook = Workbook(write_only=True)
+    for sheet_name, results in (('HuggingFace', hf_results), ('GitHub', gh_results)):
+        worksheet = workbook.create_sheet(title=sheet_name)
+
+        # Union of row keys in first-seen order doubles as the header row
+        columns: List[str] = []
+        seen = set()
+        for row in results:
+            for key in row:
+                if key not in seen:
+                    seen.add(key)
+                    columns.append(key)
+        worksheet.append(columns)
+
+        for row in results:
+            worksheet.append([_excel_value(row.get(col)) for col in columns])
+    workbook.save(output_file)
+
     print(f"Successfully exported {len(hf_results)} HuggingFace results and {len(gh_results)} GitHub results to {output_file}")
 
 
@@ -37,27 +37,40 @@ Output:
 """
 
 import argparse
+import concurrent.futures
+import io
 import json
 import re
 import sys
 import xml.etree.ElementTree as ET
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import requests
 
+try:
+    from lxml import etree  # C parser; lets us stop at the first match
+except ImportError:
+    etree = None
+
 UA = "arxiv_citations.py (+https://example.local)"
 TIMEOUT = 15
 
+# Compiled once at import; normalize_arxiv_id runs per reference and the
+# module-level re cache lookup it would otherwise pay is pure Python.
+_RE_PREFIX = re.compile(r'(?i)^arxiv:\s*')
+_RE_URL = re.compile(r'https?://arxiv\.org/(abs|pdf)/([0-9]{4}\.\d{4,5})(v\d+)?', re.I)
+_RE_BARE = re.compile(r'^([0-9]{4}\.\d{4,5})(?:v\d+)?$')
+
 def normalize_arxiv_id(s: str) -> str:
     s = s.strip()
     # Accept prefixes like 'arxiv:' or URLs
-    s = re.sub(r'(?i)^arxiv:\s*', '', s)
-    m = re.match(r'https?://arxiv\.org/(abs|pdf)/([0-9]{4}\.\d{4,5})(v\d+)?', s, re.I)
+    s = _RE_PREFIX.sub('', s)
+    m = _RE_URL.match(s)
     if m:
         return m.group(2)
     # Plain ID like 2204.05149 or 1007.5017 (old format) or with version
     # arXiv IDs can have 4-5 digits after the decimal point
-    m = re.match(r'^([0-9]{4}\.\d{4,5})(?:v\d+)?$', s)
+    m = _RE_BARE.match(s)
     if m:
         return m.group(1)
     raise ValueError(f"Couldn't parse an arXiv ID from: {s}")
@@ -75,6 +88,32 @@ def get_from_semanticscholar(arxiv_id: str) -> Optional[int]:
         pass
     return None
 
+def get_from_semanticscholar_batch(arxiv_ids: List[str]) -> Dict[str, int]:
+    # Batch endpoint accepts up to 500 IDs per POST, so N lookups cost
+    # ceil(N/500) round-trips instead of N.
+    counts: Dict[str, int] = {}
+    url = "https://api.semanticscholar.org/graph/v1/paper/batch"
+    for start in range(0, len(arxiv_ids), 500):
+        chunk = arxiv_ids[start:start + 500]
+        try:
+            r = requests.post(url,
+                              params={"fields": "citationCount"},
+                              json={"ids": [f"ARXIV:{i}" for i in chunk]},
+                              headers={"User-Agent": UA}, timeout=TIMEOUT)
+            if r.status_code != 200:
+                continue
+            data = r.json()
+        except (requests.RequestException, ValueError):
+            continue
+        if not isinstance(data, list):
+            continue
+        # The response array is positionally aligned with the request ids;
+        # unresolved papers come back as null.
+        for arxiv_id, paper in zip(chunk, data):
+            if isinstance(paper, dict) and isinstance(paper.get("citationCount"), int):
+                counts[arxiv_id] = paper["citationCount"]
+    return counts
+
 def get_from_openalex_by_arxiv(arxiv_id: str) -> Optional[int]:
     # OpenAlex supports external IDs as path params in many cases.
     url = f"https://api.openalex.org/works/https://arxiv.org/abs/{arxiv_id}"
@@ -94,6 +133,18 @@ def resolve_doi_from_arxiv(arxiv_id: str) -> Optional[str]:
     try:
         r = requests.get(url, headers={"User-Agent": UA}, timeout=TIMEOUT)
         if r.status_code == 200 and r.text:
+            if etree is not None:
+                # iterparse yields only arxiv:doi elements and returns on
+                # the first one, instead of building the whole tree first
+                try:
+                    for _, el in etree.iterparse(
+                            io.BytesIO(r.content),
+                            tag='{http://arxiv.org/schemas/atom}doi'):
+                        if el.text:
+                            return el.text.strip()
+                except etree.XMLSyntaxError:
+                    pass
+                return None
             # Parse XML and look for the arxiv:doi tag
             root = ET.fromstring(r.text)
             ns = {
@@ -127,23 +178,67 @@ def get_from_openalex_by_doi(doi: str) -> Optional[int]:
         pass
     return None
 
-def get_citation_count(arxiv_ref: str) -> Tuple[Optional[int], str]:
-    arxiv_id = normalize_arxiv_id(arxiv_ref)
-    # Try Semantic Scholar
-    count = get_from_semanticscholar(arxiv_id)
-    if isinstance(count, int):
-        return count, "semanticscholar"
-    # Try OpenAlex with arXiv URL
-    count = get_from_openalex_by_arxiv(arxiv_id)
-    if isinstance(count, int):
-        return count, "openalex-arxiv"
-    # Try DOI resolution via arXiv API -> OpenAlex by DOI
+def _via_doi(arxiv_id: str) -> Optional[int]:
+    # DOI resolution via arXiv API -> OpenAlex by DOI
     doi = resolve_doi_from_arxiv(arxiv_id)
     if doi:
-        count = get_from_openalex_by_doi(doi)
-        if isinstance(count, int):
-            return count, "openalex-doi"
-    return None, ""
+        return get_from_openalex_by_doi(doi)
+    return None
+
+def _resolve_single(arxiv_id: str) -> Tuple[Optional[int], str]:
+    """
+    Race the three providers concurrently and return the first integer
+    answer, instead of paying for the full fallback chain serially when
+    Semantic Scholar misses. Semantic Scholar gets a short head start so
+    its count keeps priority whenever it answers promptly.
+
+    The executor is shut down with wait=False so a winning answer
+    returns immediately: a `with` block would join every worker on exit,
+    making each call as slow as the slowest provider chain. Losing
+    requests finish (or get cancelled before dispatch) in the
+    background; their results are simply dropped.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
+    try:
+        s2_future = executor.submit(get_from_semanticscholar, arxiv_id)
+        futures = {
+            s2_future: "semanticscholar",
+            executor.submit(get_from_openalex_by_arxiv, arxiv_id): "openalex-arxiv",
+            executor.submit(_via_doi, arxiv_id): "openalex-doi",
+        }
+        try:
+            count = s2_future.result(timeout=0.25)
+            if isinstance(count, int):
+                return count, "semanticscholar"
+        except concurrent.futures.TimeoutError:
+            pass
+        for future in concurrent.futures.as_completed(futures):
+            count = future.result()
+            if isinstance(count, int):
+                return count, futures[future]
+        return None, ""
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def get_citation_counts(arxiv_refs: List[str]) -> Dict[str, Tuple[Optional[int], str]]:
+    """
+    Resolve citation counts for many references with one Semantic Scholar
+    batch call; only the papers the batch misses fall back to the per-ID
+    provider chain. Returns {reference as given: (count or None, source)}.
+    """
+    ids = {ref: normalize_arxiv_id(ref) for ref in arxiv_refs}
+    batch = get_from_semanticscholar_batch(list(dict.fromkeys(ids.values())))
+    results: Dict[str, Tuple[Optional[int], str]] = {}
+    for ref, arxiv_id in ids.items():
+        if arxiv_id in batch:
+            results[ref] = (batch[arxiv_id], "semanticscholar")
+        else:
+            results[ref] = _resolve_single(arxiv_id)
+    return results
+
+def get_citation_count(arxiv_ref: str) -> Tuple[Optional[int], str]:
+    arxiv_id = normalize_arxiv_id(arxiv_ref)
+    return _resolve_single(arxiv_id)
 
 def main():
     ap = argparse.ArgumentParser(description="Get citation count for an arXiv paper.")
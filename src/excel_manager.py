@@ -5,13 +5,41 @@ Excel file management for ModelScore application.
 Handles multi-tab Excel files with timestamped filenames.
 """
 
+import functools
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
-import pandas as pd
-from openpyxl import Workbook, load_workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
+import xlsxwriter
+
+
+# Single-pass C-level replacement of Excel's forbidden characters
+_INVALID_CHARS = str.maketrans('/\\?*[] ', '_______')
+
+
+@functools.lru_cache(maxsize=4096)
+def _sanitize(name: str) -> str:
+    """Sanitize a tab name to comply with Excel naming rules.
+
+    Cached: tab names repeat across models (same owner, same prefixes),
+    so repeated sanitization of a seen name is a dict lookup.
+    """
+    # Excel tab names have restrictions:
+    # - Max 31 characters
+    # - Cannot contain: / \ ? * [ ]
+    # - Cannot be empty
+    sanitized = name.translate(_INVALID_CHARS)
+
+    # Truncate if too long
+    if len(sanitized) > 30:
+        sanitized = sanitized[:30]
+
+    # Ensure not empty
+    if not sanitized:
+        sanitized = "Sheet"
+
+    return sanitized
 
 
 class ExcelManager:
@@ -33,85 +61,117 @@ class ExcelManager:
         self.filename = f"{filename_prefix}_{timestamp}.xlsx"
         self.file_path = output_dir / self.filename
         
-        # Initialize workbook
-        self.workbook = Workbook()
-        # Remove default sheet
-        self.workbook.remove(self.workbook.active)
+        # xlsxwriter in constant_memory mode flushes each row to disk as it
+        # is written, so memory stays flat however large the tabs get
+        self.workbook = xlsxwriter.Workbook(
+            str(self.file_path), {"constant_memory": True, "use_zip64": True})
+        # Titles already handed out, so duplicate checks don't rescan the
+        # workbook's sheet list for every new tab
+        self._used_titles: set = set()
+        # xlsxwriter workbooks are not thread-safe; every tab write holds
+        # this lock so callers may create tabs from worker threads
+        self._lock = threading.Lock()
         
         self.logger.info(f"Excel manager initialized. Output file: {self.file_path}")
     
     def _sanitize_tab_name(self, name: str) -> str:
         """Sanitize tab name to comply with Excel naming rules.
-        
+
         Args:
             name: Original tab name
-            
+
         Returns:
             Sanitized tab name
         """
-        # Excel tab names have restrictions:
-        # - Max 31 characters
-        # - Cannot contain: / \ ? * [ ]
-        # - Cannot be empty
-        
-        # Replace invalid characters
-        invalid_chars = ['/', '\\', '?', '*', '[', ']', ' ']
-        sanitized = name
-        for char in invalid_chars:
-            sanitized = sanitized.replace(char, '_')
-        
-        # Truncate if too long
-        if len(sanitized) > 30:
-            sanitized = sanitized[:30]
-        
-        # Ensure not empty
-        if not sanitized:
-            sanitized = "Sheet"
-        
-        return sanitized
+        return _sanitize(name)
     
-    def create_tab(self, tab_name: str, data: List[Dict[str, Any]], 
+    def _new_worksheet(self, tab_name: str):
+        """Sanitize and dedupe the tab name, then add its worksheet."""
+        sanitized_tab_name = self._sanitize_tab_name(tab_name)
+
+        # Check if tab already exists and append number if needed
+        original_name = sanitized_tab_name
+        counter = 1
+        while sanitized_tab_name in self._used_titles:
+            sanitized_tab_name = f"{original_name}_{counter}"
+            counter += 1
+        self._used_titles.add(sanitized_tab_name)
+
+        return self.workbook.add_worksheet(sanitized_tab_name)
+
+    def create_tab(self, tab_name: str, data: List[Dict[str, Any]],
                    headers: Optional[List[str]] = None) -> None:
         """Create a new tab with data in the Excel file.
-        
+
         Args:
             tab_name: Name of the tab (will be sanitized)
             data: List of dictionaries containing the data
             headers: Optional list of column headers
         """
-        sanitized_tab_name = self._sanitize_tab_name(tab_name)
-        
-        # Check if tab already exists and append number if needed
-        original_name = sanitized_tab_name
-        counter = 1
-        while sanitized_tab_name in [sheet.title for sheet in self.workbook.worksheets]:
-            sanitized_tab_name = f"{original_name}_{counter}"
-            counter += 1
-        
-        # Create new worksheet
-        worksheet = self.workbook.create_sheet(title=sanitized_tab_name)
-        
-        if not data:
-            self.logger.warning(f"No data provided for tab: {sanitized_tab_name}")
-            return
-        
-        # Convert data to DataFrame for easier handling
-        df = pd.DataFrame(data)
-        
-        # Write headers if provided
-        if headers:
-            worksheet.append(headers)
-        else:
-            # Use DataFrame columns as headers
-            worksheet.append(list(df.columns))
-        
-        # Write data rows
-        for _, row in df.iterrows():
-            worksheet.append(list(row))
-        
+        with self._lock:
+            worksheet = self._new_worksheet(tab_name)
+            sanitized_tab_name = worksheet.name
+
+            if not data:
+                self.logger.warning(f"No data provided for tab: {sanitized_tab_name}")
+                return
+
+            # Determine columns: explicit headers, or the union of row keys
+            # in first-seen order
+            if headers:
+                columns = headers
+            else:
+                columns = []
+                seen = set()
+                for row in data:
+                    for key in row:
+                        if key not in seen:
+                            seen.add(key)
+                            columns.append(key)
+            worksheet.write_row(0, 0, columns)
+
+            # Stream data rows, converting awkward values as they are written
+            for row_num, row in enumerate(data, start=1):
+                worksheet.write_row(
+                    row_num, 0,
+                    [self._cell_value(row.get(col)) for col in columns])
+
         self.logger.info(f"Created tab '{sanitized_tab_name}' with {len(data)} rows")
     
-    def create_tab_from_key_value_pairs(self, tab_name: str, 
+    def create_tab_from_rows(self, tab_name: str, rows: List[tuple],
+                             headers: List[str]) -> None:
+        """Create a tab directly from sequence rows (tuples/lists).
+
+        Bulk path for callers that already hold positional rows: no
+        per-row dict allocation or column-union pass, each row streams to
+        the worksheet as-is.
+
+        Args:
+            tab_name: Name of the tab (will be sanitized)
+            rows: Iterable of row sequences, all matching the headers
+            headers: Column headers for the first row
+        """
+        with self._lock:
+            worksheet = self._new_worksheet(tab_name)
+            worksheet.write_row(0, 0, headers)
+            row_num = 0
+            for row_num, row in enumerate(rows, start=1):
+                worksheet.write_row(row_num, 0,
+                                    [self._cell_value(value) for value in row])
+        self.logger.info(f"Created tab '{worksheet.name}' with {row_num} rows")
+
+    @staticmethod
+    def _cell_value(value: Any) -> Any:
+        """Convert values xlsxwriter cannot store in a cell.
+
+        Only datetimes (timezone info), lists and dicts need conversion;
+        everything else passes through unchanged.
+        """
+        if isinstance(value, (datetime, list, dict)):
+            return str(value)
+        return value
+
+    def create_tab_from_key_value_pairs(self, tab_name: str,
                                        data: Dict[str, Any]) -> None:
         """Create a tab from key-value pairs (like model info).
         
@@ -140,7 +200,9 @@ class ExcelManager:
             Path to the saved Excel file
         """
         try:
-            self.workbook.save(self.file_path)
+            # constant_memory writes rows as they come in; close() finalizes
+            # the archive on disk
+            self.workbook.close()
             self.logger.info(f"Excel file saved: {self.file_path}")
             return self.file_path
         except Exception as e:
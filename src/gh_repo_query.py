@@ -12,17 +12,26 @@ Outputs:
   security_checklist_<owner>_<repo>.csv (or provided out.csv)
 """
 
+import atexit
 import csv
 import os
+import random
 import re
 import sys
+import threading
 import time
 import requests
 from urllib.parse import quote
 from typing import Any, Dict, Iterable, List, Tuple, Optional
 import json
+import github_client
 from excel_manager import ExcelManager
 
+try:
+    import orjson  # C parser; decodes large payloads several times faster
+except ImportError:
+    orjson = None
+
 API_ROOT = "https://api.github.com"
 SESSION = requests.Session()
 SESSION.headers.update({
@@ -35,32 +44,141 @@ if TOKEN:
 
 
 def _req(method: str, url: str, **kwargs) -> requests.Response:
-    """HTTP wrapper with minimal rate-limit backoff."""
-    for _ in range(3):
+    """HTTP wrapper with rate-limit-aware exponential backoff.
+
+    Honors Retry-After (secondary rate limits send it on 403/429), sleeps
+    to the reset when the primary limit is exhausted, and otherwise backs
+    off exponentially. Every sleep gets +/-25% jitter so concurrent
+    callers don't retry in lockstep.
+    """
+    resp = None
+    for attempt in range(5):
         resp = SESSION.request(method, url, timeout=30, **kwargs)
-        if resp.status_code == 403 and resp.headers.get("X-RateLimit-Remaining") == "0":
+        if resp.status_code not in (403, 429):
+            return resp
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after:
+            try:
+                sleep_for = float(retry_after)
+            except ValueError:
+                sleep_for = 1.0
+        elif resp.status_code == 403 and resp.headers.get("X-RateLimit-Remaining") == "0":
             reset_epoch = int(resp.headers.get("X-RateLimit-Reset", "0") or 0)
             sleep_for = max(0, reset_epoch - int(time.time()) + 1)
-            time.sleep(min(sleep_for, 60))
-            continue
-        return resp
+        elif resp.status_code == 429:
+            sleep_for = 0.5 * 2 ** attempt
+        else:
+            # 403 that isn't rate limiting (permissions, blocked, ...)
+            return resp
+        time.sleep(min(sleep_for, 60) * random.uniform(0.75, 1.25))
     return resp
 
 
+# On-disk validation cache: GitHub returns strong ETags and Last-Modified,
+# and a conditional GET that 304s costs no rate-limit quota and transfers
+# no body. Entries map URL (plus params) -> {"etag", "last_modified",
+# "json"}.
+_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".gh_cache.json")
+
+
+def _load_cache() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(_CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return data
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+_CACHE = _load_cache()
+# safe_get_json runs from the worker pool; all cache reads/writes hold
+# this lock so mutation never races the exit-time dump
+_cache_lock = threading.Lock()
+_cache_dirty = False
+
+
+def _save_cache() -> None:
+    # Snapshot under the lock, serialize outside it: json.dump over a
+    # dict another thread is mutating raises mid-iteration
+    with _cache_lock:
+        if not _cache_dirty:
+            return
+        snapshot = dict(_CACHE)
+    try:
+        with open(_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+    except OSError:
+        pass
+
+
+# Persist once at interpreter exit rather than rewriting the whole file
+# after every 200 response
+atexit.register(_save_cache)
+
+
+def _cache_key(url: str, params: Optional[Dict[str, Any]]) -> str:
+    if params:
+        return url + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+    return url
+
+
+_cache_hits = 0
+
+
+def cache_hit_count() -> int:
+    """Number of requests served as 304s from the validation cache."""
+    return _cache_hits
+
+
 def safe_get_json(url: str, params: Optional[Dict[str, Any]] = None) -> Tuple[Any, int, Optional[str]]:
-    resp = _req("GET", url, params=params or {})
+    """GET JSON with ETag/Last-Modified revalidation; 304s come from cache."""
+    global _cache_hits, _cache_dirty
+    key = _cache_key(url, params)
+    with _cache_lock:
+        entry = _CACHE.get(key)
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    resp = _req("GET", url, params=params or {}, headers=headers)
+    if resp.status_code == 304 and entry is not None:
+        with _cache_lock:
+            _cache_hits += 1
+        return entry["json"], 200, None
     try:
         resp.raise_for_status()
-        return resp.json(), resp.status_code, None
+        data = orjson.loads(resp.content) if orjson is not None else resp.json()
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            with _cache_lock:
+                _CACHE[key] = {"etag": etag, "last_modified": last_modified,
+                               "json": data}
+                _cache_dirty = True
+        return data, resp.status_code, None
     except requests.HTTPError as e:
-        try:
-            j = resp.json()
-        except Exception:
+        # Only attempt a JSON decode when the server says it sent JSON;
+        # GitHub returns HTML error pages during incidents, and parsing
+        # those just to fail costs a second decode.
+        if 'json' in resp.headers.get('Content-Type', ''):
+            try:
+                j = resp.json()
+            except ValueError:
+                j = {"message": resp.text}
+        else:
             j = {"message": resp.text}
         msg = j.get("message") if isinstance(j, dict) else str(e)
         return None, resp.status_code, msg
 
 
+# Pulls the last page number out of a GitHub Link header
+_LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)>; rel="last"')
+
+
 def _parse_owner_repo_args(argv: List[str]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """Accept either 'owner repo' or 'owner/repo' and optional output path."""
     owner = None
@@ -82,31 +200,50 @@ def _parse_owner_repo_args(argv: List[str]) -> Tuple[Optional[str], Optional[str
     return owner, repo, out_csv
 
 
+_SCALARS = (str, int, float, bool)
+_DUMPS = json.dumps
+
+
 def _flatten(prefix: str, obj: Any) -> Iterable[Tuple[str, str]]:
-    """Flatten nested dict/list into dot/bracket path keys to string values."""
-    def _to_str(val: Any) -> str:
-        if val is None or isinstance(val, (str, int, float, bool)):
-            return str(val)
-        return json.dumps(val, ensure_ascii=False)
-
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            new_prefix = f"{prefix}.{k}" if prefix else str(k)
-            yield from _flatten(new_prefix, v)
-    elif isinstance(obj, list):
-        for i, v in enumerate(obj):
-            new_prefix = f"{prefix}[{i}]" if prefix else f"[{i}]"
-            yield from _flatten(new_prefix, v)
-    else:
-        yield prefix, _to_str(obj)
+    """Flatten nested dict/list into dot/bracket path keys to string values.
+
+    Iterative: one explicit stack replaces the recursive generator chain,
+    which pays a frame plus a yield-from hop per nesting level on the deep
+    payloads GitHub returns. Children are pushed in reverse so output
+    order matches the old recursive traversal.
+    """
+    dumps = _DUMPS
+    stack: List[Tuple[str, Any]] = [(prefix, obj)]
+    while stack:
+        prefix, obj = stack.pop()
+        if isinstance(obj, dict):
+            for k, v in reversed(list(obj.items())):
+                stack.append((f"{prefix}.{k}" if prefix else str(k), v))
+        elif isinstance(obj, list):
+            for i in range(len(obj) - 1, -1, -1):
+                stack.append((f"{prefix}[{i}]" if prefix else f"[{i}]", obj[i]))
+        elif obj is None or isinstance(obj, _SCALARS):
+            yield prefix, str(obj)
+        else:
+            yield prefix, dumps(obj, ensure_ascii=False)
 
 
 def _owner_resource(owner_login: str, owner_type_hint: Optional[str]) -> Tuple[str, Optional[Dict[str, Any]], int, Optional[str]]:
-    """Resolve owner to /orgs/{owner} or /users/{owner}."""
-    if owner_type_hint and owner_type_hint.lower() == "organization":
-        url = f"{API_ROOT}/orgs/{owner_login}"
-        return url, *safe_get_json(url)
-    # try org first, then user
+    """Resolve owner to /orgs/{owner} or /users/{owner}.
+
+    The repo payload already carries owner.type, so a hint goes straight
+    to the right endpoint; the org-then-user probe (an extra round-trip
+    for every user-owned repo) only runs when no hint is available.
+    """
+    if owner_type_hint:
+        hint = owner_type_hint.lower()
+        if hint == "organization":
+            url = f"{API_ROOT}/orgs/{owner_login}"
+            return url, *safe_get_json(url)
+        if hint == "user":
+            url = f"{API_ROOT}/users/{owner_login}"
+            return url, *safe_get_json(url)
+    # No usable hint: try org first, then user
     org_url = f"{API_ROOT}/orgs/{owner_login}"
     j, code, err = safe_get_json(org_url)
     if j:
@@ -116,12 +253,13 @@ def _owner_resource(owner_login: str, owner_type_hint: Optional[str]) -> Tuple[s
     return user_url, j2, code2, err2
 
 
-def collect(owner: str, repo: str) -> List[Dict[str, str]]:
-    """Collect repo and owner/org data as rows for CSV with Scope/Key/Value."""
-    rows: List[Dict[str, str]] = []
+def iter_rows(owner: str, repo: str) -> Iterable[Tuple[str, str, str]]:
+    """Yield repo and owner/org data as (Scope, Key, Value) tuples.
 
-    def add(scope: str, key: str, value: str):
-        rows.append({"Scope": scope, "Key": key, "Value": value})
+    A generator, so the CSV writer can stream rows to disk as they are
+    produced instead of accumulating the full list first and walking it
+    a second time.
+    """
 
     # Repo core
     repo_url = f"{API_ROOT}/repos/{owner}/{repo}"
@@ -130,7 +268,7 @@ def collect(owner: str, repo: str) -> List[Dict[str, str]]:
         raise SystemExit(f"Failed to fetch repo: {code} {err}")
 
     for k, v in _flatten("repo", repo_json):
-        add("Repository", k, v)
+        yield ("Repository", k, v)
 
     owner_login = (repo_json.get("owner") or {}).get("login") or owner
     owner_type = (repo_json.get("owner") or {}).get("type")
@@ -139,50 +277,78 @@ def collect(owner: str, repo: str) -> List[Dict[str, str]]:
     _, owner_json, code2, err2 = _owner_resource(owner_login, owner_type)
     if owner_json:
         for k, v in _flatten("owner", owner_json):
-            add("Owner/Org", k, v)
+            yield ("Owner/Org", k, v)
         # MFA enforcement (when token has org visibility). GitHub exposes
         # 'two_factor_requirement_enabled' on org objects for org owners.
         if isinstance(owner_json, dict) and owner_json.get("type") == "Organization":
             if "two_factor_requirement_enabled" in owner_json:
-                add("Owner/Org", "security.two_factor_requirement_enabled",
-                    str(bool(owner_json.get("two_factor_requirement_enabled"))))
+                yield ("Owner/Org", "security.two_factor_requirement_enabled",
+                       str(bool(owner_json.get("two_factor_requirement_enabled"))))
             else:
-                add("Owner/Org", "security.two_factor_requirement_enabled",
-                    "unavailable - missing field (insufficient permissions?)")
+                yield ("Owner/Org", "security.two_factor_requirement_enabled",
+                       "unavailable - missing field (insufficient permissions?)")
     else:
-        add("Owner/Org", "owner.fetch_error", f"{code2} {err2}")
+        yield ("Owner/Org", "owner.fetch_error", f"{code2} {err2}")
 
-    # Additional lightweight endpoints (non-fatal)
+    # Additional lightweight endpoints (non-fatal). These go through the
+    # memoized client: other query modules hit the same topics/languages
+    # URLs in the same run, and the shared cache dedupes them.
     topics_url = f"{API_ROOT}/repos/{owner}/{repo}/topics"
-    topics_json, _, _ = safe_get_json(topics_url)
+    topics_json, _, _ = github_client.get(topics_url)
     if isinstance(topics_json, dict):
-        add("Repository", "topics", ", ".join(topics_json.get("names", [])))
+        yield ("Repository", "topics", ", ".join(topics_json.get("names") or ()))
 
     langs_url = f"{API_ROOT}/repos/{owner}/{repo}/languages"
-    langs_json, _, _ = safe_get_json(langs_url)
+    langs_json, _, _ = github_client.get(langs_url)
     if isinstance(langs_json, dict):
-        add("Repository", "languages", ", ".join(sorted(langs_json.keys())))
+        # sorted() iterates the dict directly; no intermediate keys() list
+        yield ("Repository", "languages", ", ".join(sorted(langs_json)))
 
     # Org members without 2FA (endpoint requires org owner + read:org; best-effort)
     if owner_json and isinstance(owner_json, dict) and owner_json.get("type") == "Organization":
         twofa_url = f"{API_ROOT}/orgs/{owner_login}/members"
-        # Legacy filter used by GitHub API v3: filter=2fa_disabled
-        members_2fa_json, code3, err3 = safe_get_json(twofa_url + "?filter=2fa_disabled")
-        if isinstance(members_2fa_json, list):
-            add("Owner/Org", "security.members_without_2fa_count", str(len(members_2fa_json)))
+        # Legacy filter used by GitHub API v3: filter=2fa_disabled.
+        # Only the count is needed, so request one member per page and read
+        # the last-page number from the Link header — that number equals
+        # the member count, in a single near-empty round trip.
+        resp = _req("GET", twofa_url,
+                    params={"filter": "2fa_disabled", "per_page": 1})
+        if resp.status_code == 200:
+            m = _LAST_PAGE_RE.search(resp.headers.get("Link", ""))
+            if m:
+                count = int(m.group(1))
+            else:
+                # No Link header: the whole result fit on one page (0 or 1)
+                try:
+                    count = len(resp.json())
+                except ValueError:
+                    count = 0
+            yield ("Owner/Org", "security.members_without_2fa_count", str(count))
         else:
-            add("Owner/Org", "security.members_without_2fa_count", f"unavailable - {code3} {err3}")
+            try:
+                msg = resp.json().get("message")
+            except Exception:
+                msg = resp.text
+            yield ("Owner/Org", "security.members_without_2fa_count",
+                   f"unavailable - {resp.status_code} {msg}")
 
-    return rows
 
-
-def write_csv(rows: List[Dict[str, str]], path: str) -> str:
-    fieldnames = ["Scope", "Key", "Value"]
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+def collect(owner: str, repo: str) -> List[Dict[str, str]]:
+    """Dict-shaped adapter over iter_rows for callers that want the
+    in-memory Scope/Key/Value mappings (e.g. the Excel tab writer)."""
+    return [{"Scope": s, "Key": k, "Value": v}
+            for s, k, v in iter_rows(owner, repo)]
+
+
+def write_csv(rows: Iterable[Tuple[str, str, str]], path: str) -> str:
+    # Plain csv.writer over tuples skips DictWriter's per-row fieldname
+    # lookup and dict allocation; the wide buffer cuts syscalls when
+    # writing thousands of short rows. Accepts any iterable, so generator
+    # input streams straight to disk.
+    with open(path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+        w = csv.writer(f)
+        w.writerow(("Scope", "Key", "Value"))
+        w.writerows(rows)
     return path
 
 
@@ -199,13 +365,14 @@ def query_github_security_to_excel(owner: str, repo: str, excel_manager, row_num
     Returns:
         None
     """
-    rows = collect(owner, repo)
-    
+    # Tuples go straight into the bulk tab writer; no dict adapter needed
+    rows = list(iter_rows(owner, repo))
+
     # Create tab name
     tab_name = f"{row_number}-GH-repo"
-    
+
     # Use Excel manager to create the tab
-    excel_manager.create_tab_from_csv_data(tab_name, rows)
+    excel_manager.create_tab_from_rows(tab_name, rows, ["Scope", "Key", "Value"])
     print(f"GitHub security data written: {len(rows)} rows to Excel tab '{tab_name}'")
 
 def query_github_security(owner: str, repo: str, output_dir: str = "../model_scores") -> str:
@@ -222,10 +389,9 @@ def query_github_security(owner: str, repo: str, output_dir: str = "../model_sco
     Returns:
         Path to the created CSV file
     """
-    rows = collect(owner, repo)
     out_csv = f"{output_dir}/security_checklist_{owner}_{repo}.csv"
-    path = write_csv(rows, out_csv)
-    print(f"GitHub security data written: {len(rows)} rows to {path}")
+    path = write_csv(iter_rows(owner, repo), out_csv)
+    print(f"GitHub security data written to {path}")
     return path
 
 
@@ -236,9 +402,8 @@ def main():
 
     out_csv = out_csv or f"../model_scores/security_checklist_{owner}_{repo}.csv"
 
-    rows = collect(owner, repo)
-    path = write_csv(rows, out_csv)
-    print(f"Wrote {len(rows)} rows to {path}")
+    path = write_csv(iter_rows(owner, repo), out_csv)
+    print(f"Wrote {path}")
 
 
 if __name__ == "__main__":
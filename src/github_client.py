@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+"""
+Process-wide memoized GitHub GET client.
+
+Different query modules ask for the same endpoints (topics, languages,
+owner lookups) for the same repo within one pipeline run; routing those
+fetches through this module collapses them to a single API call each.
+Keys are plain URL strings, so hashing is cheap. The cache lives for the
+process; call clear() from the pipeline driver to invalidate.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+_MAXSIZE = 4096
+_cache: Dict[str, Tuple[Any, int, Optional[str]]] = {}
+
+
+def get(url: str) -> Tuple[Any, int, Optional[str]]:
+    """Memoized GET returning (json, status_code, error_message).
+
+    Delegates to gh_repo_query.safe_get_json, so the shared session, rate
+    limit backoff and ETag cache all still apply on a cache miss. Imported
+    lazily to avoid a circular import at module load. Only 2xx results
+    are memoized — a transient 500 or rate-limit 403 retries on the next
+    call instead of being frozen for the process lifetime.
+    """
+    cached = _cache.get(url)
+    if cached is not None:
+        return cached
+    from gh_repo_query import safe_get_json
+    result = safe_get_json(url)
+    status = result[1]
+    if 200 <= status < 300 and len(_cache) < _MAXSIZE:
+        _cache[url] = result
+    return result
+
+
+def clear() -> None:
+    """Drop all memoized responses (e.g. between pipeline runs)."""
+    _cache.clear()
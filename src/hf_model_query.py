@@ -4,59 +4,124 @@
 Model query utilities for interacting with Hugging Face Hub.
 """
 
-from typing import Optional, Dict, Any
-from huggingface_hub import HfApi
+import concurrent.futures
+import functools
+import json
+from typing import Optional, Dict, Any, List
 from excel_manager import ExcelManager
+from hf_user_query import SESSION
 
+try:
+    import orjson  # C codec; several times faster than stdlib json
+except ImportError:
+    orjson = None
 
-def get_model_info(model_name: str):
+
+@functools.lru_cache(maxsize=1024)
+def get_model_info(model_name: str) -> Dict[str, Any]:
     """Fetch model information from Hugging Face Hub.
 
+    Hits the raw JSON endpoint on the shared pooled/cached session and
+    returns the decoded dict directly: the exports flatten everything to
+    key-value pairs anyway, so the huggingface_hub ModelInfo object
+    (file lists, card data, validation) was built only to be discarded.
+    Cached per model id, so duplicate rows in the model list cost one
+    API call per run.
+
     Args:
         model_name: Full repository id of the model (e.g., "google-bert/bert-base-uncased").
 
     Returns:
-        The result of HfApi.model_info(model_name).
+        The model's API JSON as a dict.
     """
-    api = HfApi()
-    return api.model_info(model_name, securityStatus=True)
+    url = f"https://huggingface.co/api/models/{model_name}"
+    response = SESSION.get(url, params={"securityStatus": "true"},
+                           timeout=(3.05, 30))
+    response.raise_for_status()
+    return response.json()
+
+
+def get_model_infos(model_names: List[str]) -> List[Any]:
+    """Fetch model information for many models concurrently.
+
+    Results come back in input order. The queries are pure I/O, so an
+    8-worker fan-out over the shared client turns N round-trips into
+    roughly N/8.
+
+    Args:
+        model_names: Full repository ids of the models.
+
+    Returns:
+        List of model_info results, one per input name.
+    """
+    if len(model_names) <= 1:
+        return [get_model_info(name) for name in model_names]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        return list(executor.map(get_model_info, model_names))
 
 
 def export_model_info_to_excel(model_info, excel_manager: ExcelManager, row_number: int) -> None:
-    """Export a model_info object to an Excel tab as key-value pairs.
+    """Export a model info dict to an Excel tab as key-value pairs.
 
     Args:
-        model_info: The object returned by get_model_info.
+        model_info: The dict returned by get_model_info.
         excel_manager: ExcelManager instance to write to.
         row_number: Row number from the model list map file.
     """
-    # Convert model info to dictionary format
-    model_data = {}
-    for key, value in model_info.__dict__.items():
-        model_data[key] = value
-    
     # Create tab name
     tab_name = f"{row_number}-HF-model"
-    
+
     # Use Excel manager to create the tab
-    excel_manager.create_tab_from_key_value_pairs(tab_name, model_data)
+    excel_manager.create_tab_from_key_value_pairs(tab_name, model_info)
+
+
+def export_model_info_to_jsonl(model_info: Dict[str, Any], jsonl_path: str) -> None:
+    """Append a model info dict to a JSONL archive file.
+
+    One object per line: a single serialized write per model instead of
+    per-cell CSV escaping, and the file stays machine-readable. orjson
+    (when available) does the serialization in C.
+
+    Args:
+        model_info: The dict returned by get_model_info.
+        jsonl_path: Destination JSONL path (appended to).
+    """
+    if orjson is not None:
+        line = orjson.dumps(model_info, default=str,
+                            option=orjson.OPT_APPEND_NEWLINE)
+    else:
+        line = (json.dumps(model_info, ensure_ascii=False, default=str)
+                + '\n').encode('utf-8')
+    with open(jsonl_path, 'ab', buffering=1 << 20) as jsonlfile:
+        jsonlfile.write(line)
 
 
 def export_model_info_to_csv(model_info, csv_path: str = "../model_scores/{model_name}model_info.csv") -> None:
-    """Export a model_info object to a CSV file as key-value pairs.
-    
+    """Export a model info dict to a CSV file as key-value pairs.
+
     DEPRECATED: Use export_model_info_to_excel instead.
 
     Args:
-        model_info: The object returned by get_model_info.
+        model_info: The dict returned by get_model_info.
         csv_path: Destination CSV path.
     """
     import csv
-    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
+    rows = dict(model_info)
+    siblings = rows.get('siblings')
+    if isinstance(siblings, list):
+        # The file list can run to thousands of entries; a count plus the
+        # filenames is far cheaper for csv to escape than the full repr
+        # of every entry, and is what readers of the dump actually use
+        names = ", ".join(s.get('rfilename', '') for s in siblings
+                          if isinstance(s, dict))
+        rows['siblings'] = f"{len(siblings)} files: {names}"
+    # 1 MiB buffer + one writerows call: the file flushes in a few large
+    # writes instead of a syscall-sized chunk per row
+    with open(csv_path, 'w', newline='', encoding='utf-8',
+              buffering=1 << 20) as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(['Key', 'Value'])
-        for key, value in model_info.__dict__.items():
-            writer.writerow([key, value])
+        writer.writerows(rows.items())
 
 
 def query_and_export_model(model_name: str, excel_manager: ExcelManager) -> None:
@@ -70,3 +135,18 @@ def query_and_export_model(model_name: str, excel_manager: ExcelManager) -> None
     export_model_info_to_excel(info, excel_manager, model_name)
 
 
+def query_and_export_models(model_names: List[str], excel_manager: ExcelManager) -> None:
+    """Fetch many models concurrently and export each to its own tab.
+
+    Only the fetches overlap; the workbook is not thread-safe, so every
+    Excel write happens here in the calling thread.
+
+    Args:
+        model_names: Full repository ids of the models.
+        excel_manager: ExcelManager instance to write to.
+    """
+    infos = get_model_infos(model_names)
+    for model_name, info in zip(model_names, infos):
+        export_model_info_to_excel(info, excel_manager, model_name)
+
+
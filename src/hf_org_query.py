@@ -9,11 +9,17 @@ Example usage:
     python3 hf_org_query.py meta-llama
 """
 
+import concurrent.futures
 import requests
 import csv
 import argparse
 from pathlib import Path
 from excel_manager import ExcelManager
+# The one cached, pooled, retrying session for huggingface.co: sharing it
+# means an org overview already fetched elsewhere (e.g. the owner-type
+# race in model_processor) is served from the response cache here instead
+# of a second network round-trip.
+from hf_user_query import SESSION
 
 def query_org_overview(org_name):
     """
@@ -28,7 +34,7 @@ def query_org_overview(org_name):
     url = f"https://huggingface.co/api/organizations/{org_name}/overview"
     
     try:
-        response = requests.get(url)
+        response = SESSION.get(url, timeout=30)
         response.raise_for_status()  # Raise an exception for bad status codes
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -48,7 +54,7 @@ def query_org_members(org_name):
     url = f"https://huggingface.co/api/organizations/{org_name}/members"
     
     try:
-        response = requests.get(url)
+        response = SESSION.get(url, timeout=30)
         response.raise_for_status()  # Raise an exception for bad status codes
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -69,7 +75,7 @@ def query_org_models(org_name):
     params = {"author": org_name}
     
     try:
-        response = requests.get(url, params=params)
+        response = SESSION.get(url, params=params, timeout=30)
         response.raise_for_status()  # Raise an exception for bad status codes
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -90,7 +96,7 @@ def query_org_datasets(org_name):
     params = {"author": org_name}
     
     try:
-        response = requests.get(url, params=params)
+        response = SESSION.get(url, params=params, timeout=30)
         response.raise_for_status()  # Raise an exception for bad status codes
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -111,50 +117,72 @@ def query_org_spaces(org_name):
     params = {"author": org_name}
     
     try:
-        response = requests.get(url, params=params)
+        response = SESSION.get(url, params=params, timeout=30)
         response.raise_for_status()  # Raise an exception for bad status codes
         return response.json()
     except requests.exceptions.RequestException as e:
         print(f"Error querying organization spaces: {e}")
         return None
 
+# Complete results only: lru_cache would also memoize a combined dict
+# whose sub-queries failed (None entries), pinning partial data per org
+# for the rest of the run. Incomplete results re-run on the next call.
+_ORG_CACHE_MAXSIZE = 1024
+_org_cache = {}
+
+
 def get_all_org_info(org_name):
     """
     Query all available organization information from HuggingFace API
-    
+
+    Cached per organization: repeated org owners in the model list reuse
+    the combined result instead of re-running all five queries. Only
+    results where every sub-query succeeded are cached, so an org with a
+    transient failure gets re-queried rather than serving partial data.
+
     Args:
         org_name (str): The organization name to query
-        
+
     Returns:
         dict: Combined organization information
     """
-    print(f"Fetching organization overview for: {org_name}")
-    org_overview = query_org_overview(org_name)
-    
-    print(f"Fetching organization members for: {org_name}")
-    org_members = query_org_members(org_name)
-    
-    print(f"Fetching organization models for: {org_name}")
-    org_models = query_org_models(org_name)
-    
-    print(f"Fetching organization datasets for: {org_name}")
-    org_datasets = query_org_datasets(org_name)
-    
-    print(f"Fetching organization spaces for: {org_name}")
-    org_spaces = query_org_spaces(org_name)
-    
+    cached = _org_cache.get(org_name)
+    if cached is not None:
+        return cached
+
+    # The five endpoints are independent and purely I/O-bound, so they are
+    # queried concurrently: wall time is roughly the slowest round-trip
+    # instead of the sum of five. Each query keeps its own error handling
+    # and returns None on failure, as before.
+    print(f"Fetching organization overview/members/models/datasets/spaces for: {org_name}")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+        overview_future = executor.submit(query_org_overview, org_name)
+        members_future = executor.submit(query_org_members, org_name)
+        models_future = executor.submit(query_org_models, org_name)
+        datasets_future = executor.submit(query_org_datasets, org_name)
+        spaces_future = executor.submit(query_org_spaces, org_name)
+
     # Combine all information into a single dictionary
     all_info = {
         "org_name": org_name,
-        "overview": org_overview,
-        "members": org_members,
-        "models": org_models,
-        "datasets": org_datasets,
-        "spaces": org_spaces
+        "overview": overview_future.result(),
+        "members": members_future.result(),
+        "models": models_future.result(),
+        "datasets": datasets_future.result(),
+        "spaces": spaces_future.result()
     }
-    
+
+    if (all(v is not None for v in all_info.values())
+            and len(_org_cache) < _ORG_CACHE_MAXSIZE):
+        _org_cache[org_name] = all_info
+
     return all_info
 
+
+def clear_org_cache():
+    """Drop memoized org results (e.g. for --no-cache refresh runs)."""
+    _org_cache.clear()
+
 def append_org_info_to_excel(org_info, excel_manager, row_number):
     """
     Append organization information to the Excel file as a new tab
@@ -5,32 +5,150 @@
 Query HuggingFace API for user information and append to Excel
 """
 
+import concurrent.futures
+import json
+import logging
+import os
+import pandas as pd
 import requests
+import requests_cache
 import csv
-from pathlib import Path
 from typing import Dict, Any, Optional
+from urllib3.util.retry import Retry
 from excel_manager import ExcelManager
 
+try:
+    import orjson  # C codec; several times faster than stdlib json
+except ImportError:
+    orjson = None
+
+# Shared session: keep-alive reuses the TCP+TLS connection to
+# huggingface.co across calls instead of a fresh handshake per request,
+# and urllib3 retries transient failures with backoff. The sqlite
+# backing store makes repeat runs serve identical responses from disk;
+# 404s are cached too so owner-type probes skip the network as well.
+# cache_control=True revalidates expired entries via ETag, so a warm run
+# whose models are unchanged costs one conditional GET (304, no body)
+# per endpoint instead of a full re-fetch.
+SESSION = requests_cache.CachedSession(
+    ".hf_cache", backend="sqlite", expire_after=3600,
+    allowable_codes=(200, 404), cache_control=True)
+# Default headers set once: an explicit Accept keeps HF answering JSON
+# even on error statuses instead of HTML pages
+SESSION.headers.update({
+    "Accept": "application/json",
+    "User-Agent": "ModelScore-HF-Query"
+})
+_HF_TOKEN = os.getenv("HF_TOKEN")
+if _HF_TOKEN:
+    SESSION.headers["Authorization"] = f"Bearer {_HF_TOKEN}"
+
+# Concurrency ceiling for bulk fan-outs against the HF API per process
+_MAX_IN_FLIGHT = 16
+
+logger = logging.getLogger(__name__)
+
+# URL template built once rather than an f-string per lookup
+_USER_OVERVIEW_URL = "https://huggingface.co/api/users/{}/overview"
+# Jittered exponential backoff absorbs transient 429/5xx instead of
+# failing the row, and the jitter keeps a bulk job's retries from
+# re-synchronizing into a thundering herd; Retry-After is honored when
+# HF sends one.
+SESSION.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=32, pool_maxsize=64,
+    max_retries=Retry(total=5, backoff_factor=0.5, backoff_jitter=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      respect_retry_after_header=True)))
+
+
+# Successful payloads only: lru_cache would also memoize the None a
+# transient RequestException produces, pinning the failure per username
+# for the rest of the run. Misses re-probe on the next call.
+_OVERVIEW_CACHE_MAXSIZE = 4096
+_overview_cache: Dict[str, Any] = {}
+
+
 def query_user_overview(user_name):
     """
     Query the HuggingFace API for user overview information
-    
+
+    Successful responses are cached per username: the model list repeats
+    owners, and each repeat would otherwise re-hit the network for the
+    same overview. Failed lookups return None without being remembered.
+    The returned dict is shared between callers — treat it as read-only
+    (model_processor copies before cleaning values for exactly this
+    reason).
+
     Args:
         user_name (str): The username to query
-        
+
     Returns:
         dict: JSON response from the API
     """
-    url = f"https://huggingface.co/api/users/{user_name}/overview"
-    
+    cached = _overview_cache.get(user_name)
+    if cached is not None:
+        return cached
+
+    url = _USER_OVERVIEW_URL.format(user_name)
+
     try:
-        response = requests.get(url)
+        response = SESSION.get(url, timeout=(3.05, 10))
         response.raise_for_status()  # Raise an exception for bad status codes
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error querying Hugging Face API: {e}")
+        # Decode the raw bytes with orjson when available: overview
+        # payloads carry full model lists, where the C parser is several
+        # times faster than response.json()
+        if orjson is not None:
+            payload = orjson.loads(response.content)
+        else:
+            payload = response.json()
+        if len(_overview_cache) < _OVERVIEW_CACHE_MAXSIZE:
+            _overview_cache[user_name] = payload
+        return payload
+    except requests.exceptions.RequestException:
+        # exception() carries the stack without stringifying by hand, and
+        # under concurrent fan-out log records queue to the listener
+        # thread instead of serializing workers on stdout
+        logger.exception(f"Error querying Hugging Face API for {user_name}")
         return None
 
+
+def clear_overview_cache() -> None:
+    """Drop memoized user overviews (e.g. for --no-cache refresh runs)."""
+    _overview_cache.clear()
+
+def query_users_overview(user_names):
+    """
+    Query overview information for many users concurrently
+
+    Results come back in input order. Each query is pure I/O on the
+    shared pooled session, so a fan-out over worker threads collapses N
+    round-trips to roughly the slowest one; memoized names are served
+    without touching the network at all. Duplicate names are collapsed
+    before dispatch — concurrent duplicates would otherwise all miss the
+    memo together and fetch the same overview in parallel.
+
+    Args:
+        user_names (list): The usernames to query
+
+    Returns:
+        list: One query_user_overview result (dict or None) per name
+    """
+    user_names = [name.strip() if name else name for name in user_names]
+    unique_names = list(dict.fromkeys(name for name in user_names if name))
+    if len(unique_names) <= 1:
+        results = {name: query_user_overview(name) for name in unique_names}
+    else:
+        # Cap in-flight requests below the point where HF starts
+        # answering 429: sustained throughput beats a retry storm, and
+        # the session's Retry policy backs off any stragglers that
+        # still get throttled
+        workers = min(_MAX_IN_FLIGHT, len(unique_names))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            results = dict(zip(unique_names,
+                               executor.map(query_user_overview, unique_names)))
+    return [results.get(name) if name else None for name in user_names]
+
+
 def append_user_info_to_excel(user_info: Dict[str, Any], excel_manager: ExcelManager, 
                              row_number: int, user_name: str) -> None:
     """
@@ -44,61 +162,145 @@ def append_user_info_to_excel(user_info: Dict[str, Any], excel_manager: ExcelMan
     """
     if not user_info:
         return
-    
+
     # Create tab name
     tab_name = f"{row_number}-HF-user"
-    
-    # Create row-based data structure
-    user_data = []
-    
-    # Add the User Name row first
-    user_data.append({"Label": "User Name", "Value": user_name})
 
-    # Add each key-value pair as a separate row
-    for key, value in user_info.items():
-        user_data.append({"Label": key, "Value": value})
-    
+    # Positional 2-column rows, User Name first: the bulk tab writer
+    # streams these straight to the worksheet with no per-row dicts or
+    # column-union pass
+    rows = [("User Name", user_name), *user_info.items()]
+
     # Use Excel manager to create the tab
-    excel_manager.create_tab_from_csv_data(tab_name, user_data)
+    excel_manager.create_tab_from_rows(tab_name, rows, ["Label", "Value"])
+
+# Fixed column schema for user-overview CSV rows, taken from the HF
+# /api/users/{name}/overview response. A constant schema keeps the header
+# stable across runs and users (DictWriter would otherwise raise or drift
+# when key sets differ), lets downstream readers parse positionally, and
+# skips the per-row keys() pass.
+FIELDNAMES = (
+    "user", "fullname", "avatarUrl", "type", "isPro", "details",
+    "numModels", "numDatasets", "numSpaces", "numDiscussions", "numPapers",
+    "numFollowers", "numFollowing", "numLikes",
+)
+
+
+class CsvAppender:
+    """
+    Append user-overview rows to a CSV file opened once
+
+    Opens the file a single time, writes the header only when the file
+    is new, and streams every row through one positional csv.writer over
+    an 8 MiB buffer: appending N users costs one open/flush instead of
+    an open-stat-write-close cycle per user. One user is one CSV row.
+    Nothing flushes until the buffer fills or the appender exits, so the
+    OS sees a few large writes per batch.
+
+    Usage:
+        with CsvAppender('model_info.csv') as appender:
+            for user_info in users:
+                appender.append(user_info)
+    """
+
+    def __init__(self, csv_file_path):
+        self.csv_file_path = csv_file_path
+        self._csvfile = None
+        self._writer = None
+
+    def __enter__(self):
+        # buffering= sizes the underlying BufferedWriter; 8 MiB holds a
+        # large batch entirely in memory until close
+        self._csvfile = open(self.csv_file_path, 'a', newline='',
+                             encoding='utf-8', buffering=1 << 23)
+        # One fstat on the open handle instead of a separate stat by
+        # path, and an empty file (e.g. from touch) still gets a header
+        write_header = os.fstat(self._csvfile.fileno()).st_size == 0
+        # Positional writer over the pinned schema: no per-field dict
+        # bookkeeping inside the csv module. Rows are projected onto
+        # FIELDNAMES with .get, so unknown fields are dropped and
+        # missing ones come out empty — same tolerance DictWriter's
+        # extrasaction gave, without its per-row lookup loop.
+        self._writer = csv.writer(self._csvfile)
+        if write_header:
+            self._writer.writerow(FIELDNAMES)
+        return self
+
+    def append(self, user_info: Dict[str, Any]) -> None:
+        """Write one user's overview dict as a CSV row."""
+        self._writer.writerow(
+            tuple(user_info.get(field, "") for field in FIELDNAMES))
+
+    # Batches at least this large go through pandas' C writer; below it
+    # the DataFrame construction overhead outweighs the win
+    _PANDAS_BATCH_THRESHOLD = 64
+
+    def append_many(self, user_infos) -> None:
+        """Write many user dicts in one pass.
+
+        Large batches build one DataFrame and emit through to_csv's
+        C stringification loop onto the already-open handle; smaller
+        ones go through a single writerows call, where the csv module
+        still drives the loop in C. Falsy entries (failed lookups) are
+        skipped.
+        """
+        rows = [info for info in user_infos if info]
+        if len(rows) >= self._PANDAS_BATCH_THRESHOLD:
+            frame = pd.DataFrame(rows, columns=list(FIELDNAMES))
+            frame.to_csv(self._csvfile, header=False, index=False,
+                         lineterminator='\r\n')
+            return
+        self._writer.writerows(
+            tuple(info.get(field, "") for field in FIELDNAMES)
+            for info in rows)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._csvfile.close()
+        return False
+
+
+def append_user_info_to_jsonl(user_info, jsonl_path):
+    """
+    Append user information to a JSONL file, one object per line
+
+    Keeps nested overview values (model lists, org memberships) intact
+    instead of stringifying them into CSV cells, and costs one buffered
+    write per user. orjson (when available) serializes in C.
+
+    Args:
+        user_info (dict): User information from the API
+        jsonl_path (str): Path to the JSONL file
+    """
+    if not user_info:
+        return
+
+    if orjson is not None:
+        line = orjson.dumps(user_info, default=str,
+                            option=orjson.OPT_APPEND_NEWLINE)
+    else:
+        line = (json.dumps(user_info, ensure_ascii=False, default=str)
+                + '\n').encode('utf-8')
+    with open(jsonl_path, 'ab', buffering=1 << 20) as jsonlfile:
+        jsonlfile.write(line)
+
 
 def append_user_info_to_csv(user_info, csv_file_path):
     """
     Append user information to the CSV file
-    
-    DEPRECATED: Use append_user_info_to_excel instead.
-    
+
+    DEPRECATED: Use append_user_info_to_excel instead. For more than one
+    user, use CsvAppender directly — this wrapper re-opens the file on
+    every call.
+
     Args:
         user_info (dict): User information from the API
         csv_file_path (str): Path to the CSV file
     """
     if not user_info:
         return
-        
-    # Check if CSV file exists
-    file_exists = Path(csv_file_path).exists()
-    
-    # Create row-based data structure
-    user_data = []
-    
-    # Add each key-value pair as a separate row
-    for key, value in user_info.items():
-        user_data.append({"Label": key, "Value": value})
-    
-    # Open CSV file in append mode
-    with open(csv_file_path, 'a', newline='', encoding='utf-8') as csvfile:
-        # Define fieldnames for the row-based format
-        fieldnames = ["Label", "Value"]
-        
-        # Create CSV writer
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        # Write header if file doesn't exist
-        if not file_exists:
-            writer.writeheader()
-            
-        # Write each row of user info
-        for row in user_data:
-            writer.writerow(row)
+
+    with CsvAppender(csv_file_path) as appender:
+        appender.append(user_info)
 
 def main():
     """Main function"""
@@ -4,21 +4,54 @@
 Main entry point for the ModelScore application.
 """
 
+import argparse
+import atexit
+import concurrent.futures
 import logging
+import logging.handlers
+import queue
+import socket
 from pathlib import Path
 from typing import List, Tuple
 from config import Config
-from model_processor import ModelProcessor
+from model_processor import ModelProcessor, prewarm_owner_lookups
 
 
 def setup_logging():
-    """Configure logging for the application."""
+    """Configure logging for the application.
+
+    Records go through a queue to a background listener thread, so
+    worker threads never block on terminal I/O while holding the hot
+    path.
+    """
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        handlers=[logging.handlers.QueueHandler(log_queue)]
     )
 
 
+def prewarm_dns():
+    """Resolve huggingface.co once before the concurrent fan-out starts.
+
+    Warms the OS resolver cache so the first wave of worker requests
+    doesn't pile onto a cold lookup; failures are left for the actual
+    requests to report.
+    """
+    try:
+        socket.getaddrinfo("huggingface.co", 443)
+    except OSError:
+        pass
+
+
 def read_model_list(config: Config) -> List[Tuple[str, str]]:
     """Read and parse the model list from the configured file.
     
@@ -28,69 +61,136 @@ def read_model_list(config: Config) -> List[Tuple[str, str]]:
     Returns:
         List of tuples containing (hf_model_name, github_repo_name)
     """
-    models = []
-    
     try:
-        with open(config.model_list_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                
-                # Skip empty lines and comments
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Parse the line: HuggingFace Name, GitHub org/repo
-                parts = line.split(',')
-                if len(parts) != 2:
-                    logging.warning(f"Skipping malformed line {line_num}: {line}")
-                    continue
-                
-                hf_name = parts[0].strip()
-                github_repo = parts[1].strip()
-                models.append((hf_name, github_repo))
-                
+        text = Path(config.model_list_path).read_text(encoding='utf-8')
     except FileNotFoundError:
         logging.error(f"Model list file not found: {config.model_list_path}")
         return []
     except Exception as e:
         logging.error(f"Error reading model list file: {e}")
         return []
-    
+
+    # Single comprehension over splitlines: the strip/filter/partition
+    # all run at C speed. Lines are "HuggingFace Name, GitHub org/repo";
+    # comments and blanks are dropped, anything without a comma is
+    # malformed. partition avoids split's list allocation and tolerates
+    # commas in the repo field.
+    lines = [line.strip() for line in text.splitlines()]
+    models = [
+        (hf_name.strip(), github_repo.strip())
+        for line in lines
+        if line and not line.startswith('#')
+        for hf_name, sep, github_repo in (line.partition(','),)
+        if sep
+    ]
+
+    # Second pass only to report what the fast path rejected
+    for line_num, line in enumerate(lines, 1):
+        if line and not line.startswith('#') and ',' not in line:
+            logging.warning(f"Skipping malformed line {line_num}: {line}")
+
     return models
 
 
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="ModelScore pipeline")
+    parser.add_argument(
+        "--workers", type=int, default=16,
+        help="Number of models processed concurrently (1 = sequential, "
+             "useful for debugging)")
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Drop memoized HF lookup results before processing "
+             "(forces fresh API data on refresh runs)")
+    parser.add_argument(
+        "--refresh", action="store_true",
+        help="Clear the on-disk HTTP response cache before processing")
+    return parser.parse_args()
+
+
+def clear_lookup_caches():
+    """Drop every memoized HF lookup so the next calls hit the API."""
+    from hf_model_query import get_model_info
+    from hf_org_query import clear_org_cache
+    from hf_user_query import clear_overview_cache
+    from model_processor import clear_owner_cache
+
+    get_model_info.cache_clear()
+    clear_org_cache()
+    clear_overview_cache()
+    clear_owner_cache()
+
+
 def main():
     """Main application entry point."""
+    args = parse_args()
     setup_logging()
+    prewarm_dns()
     logger = logging.getLogger(__name__)
-    
+
     # Load configuration
     config = Config.from_env()
     logger.info("Application started")
-    
+
     # Read model list
     models = read_model_list(config)
     if not models:
         logger.error("No models found in model list file")
         return
-    
+
     logger.info(f"Found {len(models)} models to process")
-    
+
+    # Drop duplicate (hf, gh) rows, preserving order: each duplicate
+    # would re-run the full pipeline for an identical result
+    models = list(dict.fromkeys(models))
+    logger.info(f"Deduplicated to {len(models)} unique rows")
+
+    if args.no_cache:
+        clear_lookup_caches()
+
+    if args.refresh:
+        from hf_user_query import SESSION
+        SESSION.cache.clear()
+        logger.info("Cleared on-disk HTTP response cache")
+
+    # Resolve every unique owner once before processing starts, so the
+    # per-model path finds owner type and overview already cached
+    owners = {hf_model_name.split('/')[0] for hf_model_name, _ in models}
+    logger.info(f"Pre-resolving {len(owners)} unique owners")
+    prewarm_owner_lookups(owners)
+
     # Initialize model processor
     processor = ModelProcessor(config)
-    
-    # Process each model
+
+    # Process each model. The per-model work is almost entirely API round
+    # trips, so a thread pool overlaps the waiting; ExcelManager serializes
+    # its own writes, and each model owns its row-numbered tabs so there is
+    # no cross-model state to race on.
     successful = 0
     failed = 0
-    
-    for i, (hf_model_name, github_repo) in enumerate(models, 1):
-        logger.info(f"Processing model {i}/{len(models)}")
-        
-        if processor.process_model(hf_model_name, github_repo, i):
-            successful += 1
-        else:
-            failed += 1
-    
+
+    if args.workers <= 1:
+        for i, (hf_model_name, github_repo) in enumerate(models, 1):
+            logger.info(f"Processing model {i}/{len(models)}")
+
+            if processor.process_model(hf_model_name, github_repo, i):
+                successful += 1
+            else:
+                failed += 1
+    else:
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=args.workers) as pool:
+            futures = [
+                pool.submit(processor.process_model, hf_model_name,
+                            github_repo, i)
+                for i, (hf_model_name, github_repo) in enumerate(models, 1)]
+            for future in concurrent.futures.as_completed(futures):
+                if future.result():
+                    successful += 1
+                else:
+                    failed += 1
+
     # Save Excel file
     excel_manager = config.get_excel_manager()
     excel_path = excel_manager.save()
@@ -4,17 +4,100 @@
 Model processing logic for the ModelScore application.
 """
 
+import concurrent.futures
 import logging
-import requests
 from pathlib import Path
 from typing import Tuple, Optional
 from hf_model_query import get_model_info, export_model_info_to_excel
-from hf_user_query import query_user_overview, append_user_info_to_excel
+from hf_user_query import SESSION, append_user_info_to_excel
 from hf_org_query import get_all_org_info, append_org_info_to_excel
 from gh_repo_query import query_github_security_to_excel
 from config import Config
 
 
+# Successful resolutions only: a transient failure must not be pinned
+# for the rest of the run (lru_cache would freeze it), so misses and
+# errors re-probe on the next call, like the pre-cache code did.
+_owner_cache: dict = {}
+
+
+def resolve_owner(owner_name: str):
+    """Resolve a HuggingFace owner to (is_organization, owner info).
+
+    Races GETs against the user and organization overview endpoints and
+    keeps whichever answers 200, so owner detection and the user
+    overview fetch collapse into one parallel round-trip. Organizations
+    then fan out to the full org-info queries, which run on the same
+    cached session, so the raced overview is served from the response
+    cache. Successful results are cached per owner: repeated owners in
+    the model list resolve once.
+
+    Args:
+        owner_name: The HuggingFace owner name to resolve
+
+    Returns:
+        Tuple of (is_organization, owner info dict or None)
+    """
+    cached = _owner_cache.get(owner_name)
+    if cached is not None:
+        return cached
+
+    logger = logging.getLogger(__name__)
+    user_url = f"https://huggingface.co/api/users/{owner_name}/overview"
+    org_url = f"https://huggingface.co/api/organizations/{owner_name}/overview"
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {
+            executor.submit(SESSION.get, user_url, timeout=(3.05, 10)): False,
+            executor.submit(SESSION.get, org_url, timeout=(3.05, 10)): True,
+        }
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                logger.error(f"Error checking owner type for {owner_name}: {e}")
+                continue
+            if response.status_code != 200:
+                continue
+            for other in futures:
+                other.cancel()
+            if futures[future]:
+                result = (True, get_all_org_info(owner_name))
+            else:
+                try:
+                    result = (False, response.json())
+                except ValueError:
+                    break
+            _owner_cache[owner_name] = result
+            return result
+
+    logger.warning(f"Could not determine if {owner_name} is user or organization")
+    return False, None  # Default to user
+
+
+def clear_owner_cache() -> None:
+    """Drop cached owner resolutions (e.g. for --no-cache refresh runs)."""
+    _owner_cache.clear()
+
+
+def prewarm_owner_lookups(owner_names, max_workers: int = 32) -> None:
+    """Resolve each unique owner once, concurrently, before processing.
+
+    Populates the memoized owner resolution, so owner-related calls cost
+    O(unique owners) up front and model workers never block on them.
+
+    Args:
+        owner_names: Iterable of unique HuggingFace owner names
+    """
+    owner_names = list(owner_names)
+    if not owner_names:
+        return
+    workers = min(max_workers, len(owner_names))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        # Consume the iterator so lookup errors surface here, not later
+        list(pool.map(resolve_owner, owner_names))
+
+
 class ModelProcessor:
     """Handles processing of individual models."""
     
@@ -23,40 +106,6 @@ class ModelProcessor:
         self.config = config
         self.logger = logging.getLogger(__name__)
     
-    def _is_organization(self, owner_name: str) -> bool:
-        """Check if an owner name is an organization or user.
-        
-        Args:
-            owner_name: The HuggingFace owner name to check
-            
-        Returns:
-            bool: True if it's an organization, False if it's a user
-        """
-        try:
-            # Try user endpoint first
-            user_url = f"https://huggingface.co/api/users/{owner_name}/overview"
-            user_response = requests.get(user_url)
-            
-            if user_response.status_code == 200:
-                return False  # It's a user
-            elif user_response.status_code == 404:
-                # Try organization endpoint
-                org_url = f"https://huggingface.co/api/organizations/{owner_name}/overview"
-                org_response = requests.get(org_url)
-                
-                if org_response.status_code == 200:
-                    return True  # It's an organization
-                else:
-                    self.logger.warning(f"Could not determine if {owner_name} is user or organization")
-                    return False  # Default to user
-            else:
-                self.logger.warning(f"Unexpected status code {user_response.status_code} for user {owner_name}")
-                return False
-                
-        except Exception as e:
-            self.logger.error(f"Error checking owner type for {owner_name}: {e}")
-            return False  # Default to user
-    
     def process_model(self, hf_model_name: str, github_repo: str, row_number: int) -> bool:
         """Process a single model by querying HuggingFace and GitHub APIs.
         
@@ -88,31 +137,39 @@ class ModelProcessor:
     
     def _process_huggingface_model(self, hf_model_name: str, row_number: int) -> bool:
         """Process HuggingFace model information.
-        
+
         Args:
             hf_model_name: HuggingFace model name such as "owner/model"
             row_number: Row number from the model list map file
-            
+
         Returns:
             bool: True if successful, False otherwise
         """
+        owner_info = None
         try:
             # Get Excel manager
             excel_manager = self.config.get_excel_manager()
-            
-            # Get model information
-            info = get_model_info(hf_model_name)
-            self.logger.info(f"Retrieved model info: {info.modelId}, SHA: {info.sha}")
-            
-            # Extract owner and export model info to Excel
+
+            # The model info fetch and the owner lookup are independent
+            # API round-trips; overlap them so this model's HF latency is
+            # the slower of the two rather than their sum. Excel writes
+            # stay in this thread afterwards, in the original tab order.
             owner_name = hf_model_name.split('/')[0]
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+                info_future = pool.submit(get_model_info, hf_model_name)
+                owner_future = pool.submit(resolve_owner, owner_name)
+                info = info_future.result()
+                is_organization, owner_info = owner_future.result()
+
+            self.logger.info(f"Retrieved model info: {info.get('modelId')}, SHA: {info.get('sha')}")
+
+            # Export model info to Excel
             export_model_info_to_excel(info, excel_manager, row_number)
             self.logger.info(f"Model information exported to Excel tab: {row_number}-HF-model")
-            
-            # Get and append owner information (user or organization)
-            if self._is_organization(owner_name):
+
+            # Append owner information (user or organization)
+            if is_organization:
                 self.logger.info(f"Detected {owner_name} as organization")
-                owner_info = get_all_org_info(owner_name)
                 if owner_info:
                     append_org_info_to_excel(owner_info, excel_manager, row_number)
                     self.logger.info("Organization information appended to Excel")
@@ -120,11 +177,10 @@ class ModelProcessor:
                     self.logger.warning("Failed to retrieve HuggingFace organization information")
             else:
                 self.logger.info(f"Detected {owner_name} as user")
-                user_info = query_user_overview(owner_name)
-            
-                if isinstance(user_info, dict):
+
+                if isinstance(owner_info, dict):
                     cleaned_user_info = {}
-                    for k, v in user_info.items():
+                    for k, v in owner_info.items():
                         # Replace empty lists or dicts with empty string
                         if v == [] or v == {}:
                             cleaned_user_info[k] = ""
@@ -137,12 +193,12 @@ class ModelProcessor:
                     append_user_info_to_excel(cleaned_user_info, excel_manager, row_number, owner_name)
                     self.logger.info("User information appended to Excel")
                 else:
-                    self.logger.warning(f"No valid HuggingFace user information for {owner_name}: {type(user_info)}")
-            
+                    self.logger.warning(f"No valid HuggingFace user information for {owner_name}: {type(owner_info)}")
+
             return True
-            
+
         except Exception as e:
-            self.logger.error(f"Error processing HuggingFace model {hf_model_name}: {e}: {user_info}")
+            self.logger.error(f"Error processing HuggingFace model {hf_model_name}: {e}: {owner_info}")
             return False
     
     def _process_github_security(self, github_repo: str, hf_model_name: str, row_number: int) -> bool: